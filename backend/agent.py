@@ -1,19 +1,76 @@
-import json
+import asyncio
+import logging
 import os
-from typing import Generator
-from openai import OpenAI
+from functools import lru_cache
+from typing import AsyncGenerator, Optional
+import httpx
+import openai
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
-from tools import TOOL_REGISTRY
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 
+# Before the local imports: log reads DEBUG at import, and agent is also
+# imported on its own, e.g. by test_agent.py.
 load_dotenv()
 
-client = OpenAI(
+import batcher
+from jsonutil import dumps, loads, JSONDecodeError
+from llm_cache import LLMCache, make_key
+from log import get_logger, C_BLUE, C_GREEN, C_MAGENTA, C_RED, C_YELLOW
+from tools import TOOL_REGISTRY, to_dict
+
+logger = get_logger("agent")
+
+# One shared HTTP/2 connection pool, so requests reuse open TLS connections.
+# Retries are handled by _llm_retrying, so the SDK's own retries are disabled.
+client = AsyncOpenAI(
     base_url="https://openrouter.ai/api/v1",
     api_key=os.getenv("OPENROUTER_API_KEY", ""),
+    max_retries=0,
+    http_client=httpx.AsyncClient(
+        http2=True,
+        timeout=60.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    ),
 )
 
 MODEL = os.getenv("OPENROUTER_MODEL", "openai/gpt-4o-mini")
 
+# Tiered routing: short transcripts go to SMALL_MODEL, long ones to LARGE_MODEL.
+# Both default to MODEL, so routing only kicks in when one of them is set.
+SMALL_MODEL = os.getenv("OPENROUTER_SMALL_MODEL", MODEL)
+LARGE_MODEL = os.getenv("OPENROUTER_LARGE_MODEL", MODEL)
+
+# ~500 tokens at ~4 characters per token.
+SHORT_TRANSCRIPT_CHARS = 2000
+
+# Output caps, so the model can't over-generate on short inputs.
+SHORT_MAX_TOKENS = 2048
+LONG_MAX_TOKENS = 4096
+# Provider ceiling (gpt-4o-mini), for requests covering several transcripts.
+MAX_OUTPUT_TOKENS = 16384
+
+# Cap on LLM requests in flight across all users, to ride out bursts gracefully.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "20"))
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+# Transient errors worth retrying: rate limits, network failures and 5xx responses.
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# Coalesce concurrent /api/analyze requests into one LLM call (see run_agent_batched).
+BATCH_ENABLED = os.getenv("BATCH_ENABLED", "").lower() in ("1", "true", "yes")
+
+# Leading characters of a transcript used to group bulk requests by shared prefix.
+PREFIX_KEY_CHARS = 256
+
+_llm_cache: Optional[LLMCache] = None
+
 SYSTEM_PROMPT = """You are a Meeting AI Agent. You analyze meeting transcripts and produce structured outputs.
 
 Based on the content of the transcript, decide which tool(s) to call:
@@ -277,6 +334,70 @@ TOOLS_SCHEMA = [
 ]
 
 
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# TOOLS_SCHEMA never changes, so serialize it once for cache keys rather than
+# on every request.
+TOOLS_SCHEMA_JSON = dumps(TOOLS_SCHEMA, sort_keys=True)
+
+# --- Batched analysis ---
+# The batched prompt covers several transcripts at once, so every tool call
+# carries the ID of the transcript it belongs to, and the model reports each
+# transcript's final summary through an extra summarize_meeting tool.
+
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+
+You will receive SEVERAL transcripts in one message, each labelled with a numeric transcript ID.
+Analyze each transcript independently and never mix details between them. Every tool call MUST
+include the `transcript_id` of the transcript it is about. Finally, call **summarize_meeting**
+exactly once per transcript with a brief summary of what you produced for it."""
+
+BATCH_TOOLS_SCHEMA = [
+    {
+        "type": "function",
+        "function": {
+            **tool["function"],
+            "parameters": {
+                **tool["function"]["parameters"],
+                "properties": {
+                    "transcript_id": {
+                        "type": "integer",
+                        "description": "ID of the transcript this call is about",
+                    },
+                    **tool["function"]["parameters"]["properties"],
+                },
+                "required": ["transcript_id", *tool["function"]["parameters"]["required"]],
+            },
+        },
+    }
+    for tool in TOOLS_SCHEMA
+] + [
+    {
+        "type": "function",
+        "function": {
+            "name": "summarize_meeting",
+            "description": "Give the brief final summary for one transcript",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "transcript_id": {
+                        "type": "integer",
+                        "description": "ID of the transcript being summarized",
+                    },
+                    "summary": {
+                        "type": "string",
+                        "description": "Brief summary of what was produced for this transcript",
+                    },
+                },
+                "required": ["transcript_id", "summary"],
+            },
+        },
+    }
+]
+
+BATCH_SYSTEM_MESSAGE = {"role": "system", "content": BATCH_SYSTEM_PROMPT}
+
+
 TOOL_TAGS = {
     "create_calendar_invite": "calendar",
     "create_decision_record": "decision",
@@ -286,20 +407,85 @@ TOOL_TAGS = {
     "analyze_sentiment": "sentiment",
 }
 
-SEPARATOR = "═" * 60
 
-# ANSI color codes
-C_RESET = "\033[0m"
-C_BOLD = "\033[1m"
-C_DIM = "\033[2m"
-C_RED = "\033[31m"
-C_GREEN = "\033[32m"
-C_YELLOW = "\033[33m"
-C_BLUE = "\033[34m"
-C_MAGENTA = "\033[35m"
-C_CYAN = "\033[36m"
+# Arguments we set ourselves rather than the LLM. The .ics file is only built
+# when the user downloads it (POST /api/calendar/ics).
+TOOL_OPTIONS: dict[str, dict] = {"create_calendar_invite": {"include_ics": False}}
+
+
+def get_llm_cache() -> LLMCache:
+    """Lazy-create the response cache, so importing agent doesn't touch the database."""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache()
+    return _llm_cache
+
+
+def prefix_key(transcript: str) -> str:
+    """
+    Sort key that places transcripts with a common opening next to each other.
+    Providers cache prompt prefixes, so sending these back-to-back lets later
+    requests reuse the earlier ones' prefill.
+    """
+    return transcript[:PREFIX_KEY_CHARS]
+
+
+def _is_short(transcript: str) -> bool:
+    """Cheap length check; avoids tokenizing with a model-specific tokenizer."""
+    return len(transcript) < SHORT_TRANSCRIPT_CHARS
 
 
+def pick_model(transcript: str) -> str:
+    """Route short transcripts to the cheaper, faster model."""
+    return SMALL_MODEL if _is_short(transcript) else LARGE_MODEL
+
+
+def pick_max_tokens(transcript: str) -> int:
+    """Output cap for a transcript's analysis."""
+    return SHORT_MAX_TOKENS if _is_short(transcript) else LONG_MAX_TOKENS
+
+
+_backoff = wait_random_exponential(min=1, max=30)
+
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Honor Retry-After on rate limits, otherwise back off exponentially with jitter."""
+    error = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(error, openai.RateLimitError):
+        try:
+            return min(float(error.response.headers["retry-after"]), 60.0)
+        except (KeyError, ValueError):
+            pass
+    return _backoff(retry_state)
+
+
+def _llm_retrying() -> AsyncRetrying:
+    """Retry policy for LLM calls: up to 5 attempts on transient errors."""
+    return AsyncRetrying(
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        wait=_retry_wait,
+        stop=stop_after_attempt(5),
+        reraise=True,
+    )
+
+
+# Rendered documents the frontend needs but the LLM doesn't: the follow-up
+# request only needs each result's structured fields to write its summary.
+_RENDERED_RESULT_FIELDS = ("markdown", "csv", "ics_content", "body_html", "body_plain")
+_MAX_ITEMS_FOR_LLM = 20
+
+
+def _slim_result(result) -> dict:
+    """Strip rendered output from a tool result before sending it back to the LLM."""
+    slim = {k: v for k, v in to_dict(result).items() if k not in _RENDERED_RESULT_FIELDS}
+    items = slim.get("items")
+    if isinstance(items, list) and len(items) > _MAX_ITEMS_FOR_LLM:
+        slim["items"] = items[:_MAX_ITEMS_FOR_LLM]
+        slim["truncated"] = True
+    return slim
+
+
+@lru_cache(maxsize=256)
 def _truncate(s: str, max_len: int = 200) -> str:
     """Truncate a string for readable terminal output."""
     if len(s) <= max_len:
@@ -307,37 +493,175 @@ def _truncate(s: str, max_len: int = 200) -> str:
     return s[:max_len] + "..."
 
 
-def _print_phase(title: str) -> None:
-    """Print a phase header."""
-    print(f"\n{C_CYAN}{SEPARATOR}{C_RESET}")
-    print(f"  {C_CYAN}{C_BOLD}{title}{C_RESET}")
-    print(f"{C_CYAN}{SEPARATOR}{C_RESET}")
+def _log_phase(title: str) -> None:
+    """Log a phase header."""
+    logger.info(title, extra={"phase": True})
+
+
+def meeting_title(summary: str) -> str:
+    """Derive a meeting title from the first words of the agent's summary."""
+    words = summary.split()
+    return " ".join(words[:8]) + ("..." if len(words) > 8 else "")
 
 
-def execute_tool(tool_name: str, arguments: dict) -> dict:
-    """Execute a tool by name with the given arguments."""
+def local_summary(results: list[dict]) -> str:
+    """Summarize tool results without a follow-up LLM call."""
+    results = [to_dict(result) for result in results]
+    for result in results:
+        summary = result.get("metadata", {}).get("summary")
+        if summary:
+            return summary
+    produced = [r.get("type", "result").replace("_", " ") for r in results if "error" not in r]
+    return f"Generated {', '.join(produced)}." if produced else "Analysis complete."
+
+
+def initial_messages(transcript: str) -> list[dict]:
+    """Build the opening conversation for analyzing a transcript."""
+    return [
+        SYSTEM_MESSAGE,
+        {"role": "user", "content": f"Please analyze this meeting transcript:\n\n{transcript}"},
+    ]
+
+
+async def execute_tool(tool_name: str, arguments: dict) -> dict:
+    """Execute a tool by name with the given arguments in a worker thread."""
     func = TOOL_REGISTRY.get(tool_name)
     if func is None:
         return {"error": f"Unknown tool: {tool_name}"}
     try:
-        return func(**arguments)
+        arguments = {**arguments, **TOOL_OPTIONS.get(tool_name, {})}
+        return await asyncio.to_thread(func, **arguments)
     except Exception as e:
         return {"error": f"Tool execution failed: {str(e)}"}
 
 
-def run_agent(transcript: str) -> Generator[dict, None, None]:
+async def _execute_tool_calls(
+    tool_calls: list[dict], results: list[dict]
+) -> AsyncGenerator[dict, None]:
+    """
+    Execute tool calls concurrently, yielding tool_call/tool_result events.
+    `results` is filled with each call's result, in call order.
+    """
+    # Tools are independent of each other, so run them concurrently.
+    # Announce every call up front, then report results as they finish.
+    async def _run(index: int, tool_name: str, arguments: dict) -> tuple[int, dict]:
+        return index, await execute_tool(tool_name, arguments)
+
+    tasks = []
+    for index, tool_call in enumerate(tool_calls):
+        tool_name = tool_call["function"]["name"]
+        tag = TOOL_TAGS.get(tool_name, tool_name)
+        try:
+            arguments = loads(tool_call["function"]["arguments"])
+        except JSONDecodeError:
+            arguments = {}
+
+        logger.info("[%s] Executing %s...", tag, tool_name)
+
+        yield {
+            "type": "tool_call",
+            "tool": tool_name,
+            "arguments": arguments,
+        }
+
+        tasks.append(_run(index, tool_name, arguments))
+
+    results[:] = [{} for _ in tasks]
+    for next_done in asyncio.as_completed(tasks):
+        index, result = await next_done
+        tool_name = tool_calls[index]["function"]["name"]
+        tag = TOOL_TAGS.get(tool_name, tool_name)
+        results[index] = result
+
+        # Failures are always plain dicts; tools may return dataclasses.
+        if isinstance(result, dict) and "error" in result:
+            logger.info("[%s] ✗ %s: %s", tag, tool_name, result["error"], extra={"color": C_RED})
+        else:
+            logger.info("[%s] ✓ %s: success", tag, tool_name, extra={"color": C_GREEN})
+
+        yield {
+            "type": "tool_result",
+            "tool": tool_name,
+            "result": result,
+        }
+
+
+async def _stream_completion(
+    model: str, max_tokens: int, messages: list[dict], events: asyncio.Queue
+) -> tuple[dict, Optional[str]]:
+    """
+    Stream one chat completion, holding an LLM slot only for the request and
+    the provider's stream. Token and retry events are put on `events` as they
+    arrive, then None once the stream ends or fails. Returns the assembled
+    assistant message and the finish reason.
+    """
+    try:
+        async with llm_semaphore:
+            async for attempt in _llm_retrying():
+                if attempt.retry_state.attempt_number > 1:
+                    events.put_nowait(
+                        {
+                            "type": "thinking",
+                            "content": f"LLM busy, retrying (attempt {attempt.retry_state.attempt_number})...",
+                        }
+                    )
+                with attempt:
+                    response = await client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        tools=TOOLS_SCHEMA,
+                        tool_choice="auto",
+                        max_tokens=max_tokens,
+                        stream=True,
+                    )
+
+            # Assemble the assistant message from streamed deltas. Tool-call
+            # arguments arrive piecewise, keyed by the tool call's index.
+            content = ""
+            tool_calls: dict[int, dict] = {}
+            finish_reason = None
+            async for chunk in response:
+                if not chunk.choices:
+                    continue
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content += delta.content
+                    events.put_nowait({"type": "token", "content": delta.content})
+                for tc_delta in delta.tool_calls or []:
+                    tc = tool_calls.setdefault(
+                        tc_delta.index,
+                        {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+                    )
+                    if tc_delta.id:
+                        tc["id"] = tc_delta.id
+                    if tc_delta.function:
+                        if tc_delta.function.name:
+                            tc["function"]["name"] += tc_delta.function.name
+                        if tc_delta.function.arguments:
+                            tc["function"]["arguments"] += tc_delta.function.arguments
+
+        message = {"role": "assistant", "content": content or None}
+        if tool_calls:
+            message["tool_calls"] = [tool_calls[i] for i in sorted(tool_calls)]
+        return message, finish_reason
+    finally:
+        events.put_nowait(None)
+
+
+async def run_agent(transcript: str) -> AsyncGenerator[dict, None]:
     """
     Run the agent loop. Yields SSE events as dicts:
       {"type": "thinking", "content": "..."}
+      {"type": "token", "content": "..."}
       {"type": "tool_call", "tool": "...", "arguments": {...}}
       {"type": "tool_result", "tool": "...", "result": {...}}
       {"type": "final", "content": "..."}
       {"type": "error", "content": "..."}
     """
-    messages = [
-        {"role": "system", "content": SYSTEM_PROMPT},
-        {"role": "user", "content": f"Please analyze this meeting transcript:\n\n{transcript}"},
-    ]
+    messages = initial_messages(transcript)
+    model = pick_model(transcript)
+    max_tokens = pick_max_tokens(transcript)
 
     iteration = 0
     max_iterations = 5
@@ -346,110 +670,204 @@ def run_agent(transcript: str) -> Generator[dict, None, None]:
 
         # --- PHASE 1 / 3: LLM Request ---
         if iteration == 1:
-            _print_phase("PHASE 1: LLM Request")
+            _log_phase("PHASE 1: LLM Request")
         else:
-            _print_phase("PHASE 3: Summary Generation")
+            _log_phase("PHASE 3: Summary Generation")
 
         request_payload = {
-            "model": MODEL,
+            "model": model,
             "messages": messages,
             "tools": TOOLS_SCHEMA,
             "tool_choice": "auto",
+            "max_tokens": max_tokens,
         }
 
         if iteration == 1:
-            print(f"\n{C_BLUE}📨 Sending request to LLM...{C_RESET}")
+            logger.info("📨 Sending request to LLM...", extra={"color": C_BLUE})
+            yield {"type": "thinking", "content": "Analyzing transcript..."}
         else:
-            print(f"\n{C_BLUE}📨 Sending follow-up to LLM...{C_RESET}")
-        print(f"{C_DIM}{json.dumps(request_payload, indent=2, default=str)}{C_RESET}")
-
-        print(f"\n{C_BLUE}{C_BOLD}❇  Calling LLM...{C_RESET}")
+            logger.info("📨 Sending follow-up to LLM...", extra={"color": C_BLUE})
+            yield {"type": "thinking", "content": "Summarizing results..."}
+        # Lazy formatting: the (growing) payload is only rendered when DEBUG is on.
+        logger.debug("request payload: %s", request_payload)
+
+        logger.info("❇  Calling LLM...", extra={"color": C_BLUE})
+
+        cache_key = make_key(model, messages, TOOLS_SCHEMA_JSON)
+        message = get_llm_cache().get(cache_key)
+        if message is not None:
+            logger.info("⚡ Cache hit — skipping LLM call", extra={"color": C_GREEN})
+            if message["content"]:
+                yield {"type": "token", "content": message["content"]}
+        else:
+            # The stream is read in a separate task that holds the semaphore only
+            # while talking to the provider; its events are buffered here, so a
+            # slow SSE client doesn't keep an LLM slot busy.
+            events: asyncio.Queue = asyncio.Queue()
+            task = asyncio.create_task(_stream_completion(model, max_tokens, messages, events))
+            try:
+                while (event := await events.get()) is not None:
+                    yield event
+                message, finish_reason = await task
+            except Exception as e:
+                logger.error("❌ LLM API error: %s", e)
+                yield {"type": "error", "content": f"LLM API error: {str(e)}"}
+                return
+            finally:
+                task.cancel()
+
+            # Only cache complete replies: one cut off at max_tokens carries
+            # truncated tool-call arguments.
+            if finish_reason in ("stop", "tool_calls"):
+                get_llm_cache().set(cache_key, message)
+            else:
+                logger.warning("⚠️  LLM stopped early (%s); not caching the reply", finish_reason)
+
+        if message.get("tool_calls"):
+            # --- Log LLM response with tool selections ---
+            logger.info("🤖 LLM RESPONSE:", extra={"color": C_MAGENTA})
+            logger.info("Tool calls selected: %d", len(message["tool_calls"]), extra={"color": C_YELLOW})
+
+            if logger.isEnabledFor(logging.DEBUG):
+                for tc in message["tool_calls"]:
+                    logger.debug(
+                        "tool %s arguments: %s",
+                        tc["function"]["name"],
+                        _truncate(tc["function"]["arguments"]),
+                    )
+
+            tool_names = [tc["function"]["name"] for tc in message["tool_calls"]]
+            logger.info("✓ LLM selected %d tool(s)", len(tool_names), extra={"color": C_GREEN})
+            for name in tool_names:
+                logger.info("  • %s", name, extra={"color": C_GREEN})
 
-        try:
-            yield {"type": "thinking", "content": "Analyzing transcript..."}
+            # --- PHASE 2: Tool Execution ---
+            _log_phase(f"PHASE 2: Tool Execution ({len(message['tool_calls'])} tool(s))")
 
-            response = client.chat.completions.create(
-                model=MODEL,
-                messages=messages,
-                tools=TOOLS_SCHEMA,
-                tool_choice="auto",
-            )
-        except Exception as e:
-            print(f"\n{C_RED}{C_BOLD}❌ LLM API error: {e}{C_RESET}")
-            yield {"type": "error", "content": f"LLM API error: {str(e)}"}
-            return
+            messages.append(message)
 
-        choice = response.choices[0]
-        message = choice.message
+            results: list[dict] = []
+            async for event in _execute_tool_calls(message["tool_calls"], results):
+                yield event
 
-        if message.tool_calls:
-            # --- Log LLM response with tool selections ---
-            print(f"\n{C_MAGENTA}{C_BOLD}🤖 LLM RESPONSE:{C_RESET}")
-            print(f"{C_YELLOW}Tool calls selected: {len(message.tool_calls)}{C_RESET}")
+            # A lone report already carries its own summary, so the follow-up
+            # LLM round trip would only restate it.
+            if len(results) == 1 and to_dict(results[0]).get("metadata", {}).get("summary"):
+                logger.info(
+                    "⚡ Report summary available — skipping follow-up LLM call",
+                    extra={"color": C_GREEN},
+                )
+                final_content = local_summary(results)
+                break
 
-            for tc in message.tool_calls:
-                args_str = _truncate(tc.function.arguments)
-                print(f"\n  • Tool: {C_BOLD}{tc.function.name}{C_RESET}")
-                print(f"    {C_DIM}Arguments: {args_str}{C_RESET}")
+            # Keep tool messages in call order so the follow-up request is stable.
+            for tool_call, result in zip(message["tool_calls"], results):
+                messages.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": tool_call["id"],
+                        "content": dumps(_slim_result(result)),
+                    }
+                )
+        else:
+            # --- Final text response ---
+            final_content = message["content"] or "Analysis complete."
+            break
+    else:
+        logger.info("✅ Agent complete (max iterations reached).", extra={"color": C_GREEN})
+        yield {"type": "final", "content": "Agent finished (max iterations reached)."}
+        return
 
-            tool_names = [tc.function.name for tc in message.tool_calls]
-            print(f"\n{C_GREEN}✓ LLM selected {len(tool_names)} tool(s){C_RESET}")
-            for name in tool_names:
-                print(f"  {C_GREEN}• {name}{C_RESET}")
+    logger.info("📝 Final summary:", extra={"color": C_MAGENTA})
+    logger.info(final_content)
+    logger.info("✅ Agent complete.", extra={"color": C_GREEN})
 
-            # --- PHASE 2: Tool Execution ---
-            _print_phase(f"PHASE 2: Tool Execution ({len(message.tool_calls)} tool(s))")
+    yield {
+        "type": "final",
+        "content": final_content,
+    }
 
-            messages.append(message.model_dump())
 
-            for tool_call in message.tool_calls:
-                tool_name = tool_call.function.name
-                tag = TOOL_TAGS.get(tool_name, tool_name)
-                try:
-                    arguments = json.loads(tool_call.function.arguments)
-                except json.JSONDecodeError:
-                    arguments = {}
+@batcher.dynamically(max_batch_size=8, max_wait_ms=50)
+async def plan_batch(transcripts: list[str]) -> list[dict]:
+    """
+    Ask the LLM which tools to call for several transcripts in a single request.
+    Returns one {"tool_calls": [...], "summary": "..."} plan per transcript.
+    """
+    sections = "\n\n".join(
+        f"=== Transcript {i} ===\n{transcript}\n=== End of transcript {i} ==="
+        for i, transcript in enumerate(transcripts)
+    )
+    messages = [
+        BATCH_SYSTEM_MESSAGE,
+        {
+            "role": "user",
+            "content": f"Please analyze these {len(transcripts)} meeting transcripts:\n\n{sections}",
+        },
+    ]
 
-                print(f"\n{C_CYAN}[{tag}]{C_RESET} Executing {tool_name}...")
+    # Every transcript's tool calls come back in one response, so size the
+    # model and output cap for the combined input.
+    combined = "".join(transcripts)
+
+    logger.info(
+        "❇  Calling LLM for a batch of %d transcript(s)...",
+        len(transcripts),
+        extra={"color": C_BLUE},
+    )
+    async with llm_semaphore:
+        async for attempt in _llm_retrying():
+            with attempt:
+                response = await client.chat.completions.create(
+                    model=pick_model(combined),
+                    messages=messages,
+                    tools=BATCH_TOOLS_SCHEMA,
+                    tool_choice="auto",
+                    max_tokens=min(sum(pick_max_tokens(t) for t in transcripts), MAX_OUTPUT_TOKENS),
+                )
 
-                yield {
-                    "type": "tool_call",
-                    "tool": tool_name,
-                    "arguments": arguments,
+    plans: list[dict] = [{"tool_calls": [], "summary": ""} for _ in transcripts]
+    for tc in response.choices[0].message.tool_calls or []:
+        try:
+            arguments = loads(tc.function.arguments)
+        except JSONDecodeError:
+            continue
+        transcript_id = arguments.pop("transcript_id", None)
+        if not isinstance(transcript_id, int) or not 0 <= transcript_id < len(plans):
+            continue
+        plan = plans[transcript_id]
+        if tc.function.name == "summarize_meeting":
+            plan["summary"] = arguments.get("summary", "")
+        else:
+            plan["tool_calls"].append(
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {"name": tc.function.name, "arguments": dumps(arguments)},
                 }
+            )
+    return plans
 
-                result = execute_tool(tool_name, arguments)
 
-                if "error" in result:
-                    print(f"{C_CYAN}[{tag}]{C_RESET} {C_RED}✗ {tool_name}: {result['error']}{C_RESET}")
-                else:
-                    print(f"{C_CYAN}[{tag}]{C_RESET} {C_GREEN}✓ {tool_name}: success{C_RESET}")
+async def run_agent_batched(transcript: str) -> AsyncGenerator[dict, None]:
+    """
+    Same events as run_agent, but the LLM call is shared with other transcripts
+    submitted within the same batching window. Tools are executed locally and
+    the model's per-transcript summary becomes the final event.
+    """
+    yield {"type": "thinking", "content": "Analyzing transcript..."}
 
-                yield {
-                    "type": "tool_result",
-                    "tool": tool_name,
-                    "result": result,
-                }
+    try:
+        plan = await plan_batch(transcript)
+    except Exception as e:
+        logger.error("❌ LLM API error: %s", e)
+        yield {"type": "error", "content": f"LLM API error: {str(e)}"}
+        return
 
-                messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": json.dumps(result),
-                    }
-                )
-        else:
-            # --- Final text response ---
-            final_content = message.content or "Analysis complete."
-            print(f"\n{C_MAGENTA}{C_BOLD}📝 Final summary:{C_RESET}")
-            print(final_content)
-            print(f"\n{C_GREEN}{C_BOLD}✅ Agent complete.{C_RESET}")
-
-            yield {
-                "type": "final",
-                "content": final_content,
-            }
-            return
-
-    print(f"\n{C_GREEN}{C_BOLD}✅ Agent complete (max iterations reached).{C_RESET}")
-    yield {"type": "final", "content": "Agent finished (max iterations reached)."}
+    results: list[dict] = []
+    async for event in _execute_tool_calls(plan["tool_calls"], results):
+        yield event
+
+    final_content = plan["summary"] or "Analysis complete."
+    logger.info("✅ Agent complete.", extra={"color": C_GREEN})
+    yield {"type": "final", "content": final_content}
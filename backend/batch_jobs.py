@@ -0,0 +1,173 @@
+"""
+Offline analysis through the OpenAI Batch API.
+
+Batch jobs cost about half as much as real-time requests and don't count
+against rate limits, in exchange for results arriving within 24 hours.
+OpenRouter has no batch endpoint, so these jobs go to OpenAI directly.
+"""
+
+import asyncio
+import os
+import time
+from typing import Optional
+from openai import AsyncOpenAI
+from agent import (
+    MODEL,
+    TOOLS_SCHEMA,
+    initial_messages,
+    execute_tool,
+    meeting_title,
+    local_summary,
+    pick_max_tokens,
+)
+from database import (
+    save_batch_job,
+    get_batch_job,
+    update_batch_job,
+    claim_batch_job,
+    save_meetings_bulk,
+)
+from jsonutil import dumps, loads, JSONDecodeError
+
+_openai_client: Optional[AsyncOpenAI] = None
+
+# OpenRouter model IDs are namespaced ("openai/gpt-4o-mini"); OpenAI's are not.
+BATCH_MODEL = os.getenv("OPENAI_BATCH_MODEL", MODEL.removeprefix("openai/"))
+
+# OpenAI batch statuses after which no more output will be produced.
+FINISHED_STATUSES = ("completed", "expired", "failed", "cancelled")
+
+# Set on our side while a finished batch's results are being saved as
+# meetings, and once they have been.
+INGESTING = "ingesting"
+INGESTED = "ingested"
+
+# Running the tools for a batch takes seconds. A claim older than this was
+# left by a process that died mid-ingest, and the next refresh takes it over.
+CLAIM_TIMEOUT_SECONDS = 10 * 60
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Lazy-create the OpenAI client, so the app starts without OPENAI_API_KEY."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _openai_client
+
+
+def build_batch_file(transcripts: list[str]) -> bytes:
+    """Build the JSONL request file, one chat completion per transcript."""
+    lines = [
+        dumps(
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": BATCH_MODEL,
+                    "messages": initial_messages(transcript),
+                    "tools": TOOLS_SCHEMA,
+                    "tool_choice": "auto",
+                    "max_tokens": pick_max_tokens(transcript),
+                },
+            }
+        )
+        for i, transcript in enumerate(transcripts)
+    ]
+    return "\n".join(lines).encode("utf-8")
+
+
+async def submit_batch(transcripts: list[str]) -> dict:
+    """Upload the transcripts as a batch job and record it. Returns the job."""
+    openai_client = get_openai_client()
+    batch_file = await openai_client.files.create(
+        file=("meetings.jsonl", build_batch_file(transcripts)),
+        purpose="batch",
+    )
+    batch = await openai_client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    save_batch_job(batch.id, transcripts, batch.status)
+    return get_batch_job(batch.id)  # type: ignore[return-value]
+
+
+async def _analyze_output(body: dict) -> tuple[list[dict], str]:
+    """Run the tool calls from one batched chat completion. Returns (results, summary)."""
+    message = body["choices"][0]["message"]
+    calls = []
+    for tool_call in message.get("tool_calls") or []:
+        try:
+            arguments = loads(tool_call["function"]["arguments"])
+        except JSONDecodeError:
+            arguments = {}
+        calls.append(execute_tool(tool_call["function"]["name"], arguments))
+    results = list(await asyncio.gather(*calls))
+    return results, message.get("content") or local_summary(results)
+
+
+async def _collect_meetings(output_file_id: Optional[str], transcripts: list[str]) -> list[tuple]:
+    """
+    Run the tool calls for each successful request in a batch's output file.
+    Returns the meetings to save; failed requests are left out.
+    """
+    if not output_file_id:
+        return []
+    output = await get_openai_client().files.content(output_file_id)
+    meetings = []
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        entry = loads(line)
+        response = entry.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        transcript = transcripts[int(entry["custom_id"])]
+        results, summary = await _analyze_output(response["body"])
+        meetings.append((meeting_title(summary), transcript, results, summary))
+    return meetings
+
+
+async def refresh_batch(batch_id: str) -> Optional[dict]:
+    """
+    Check a batch job's status. Once it has finished, whether completed,
+    expired, failed or cancelled, run the returned tool calls, save one
+    meeting per successfully analyzed transcript, and mark the job as
+    ingested with a count of the transcripts that failed. Returns the job,
+    or None if it's unknown.
+    """
+    job = get_batch_job(batch_id)
+    if job is None or job["status"] == INGESTED:
+        return job
+    if job["status"] == INGESTING and time.time() - (job["claimed_at"] or 0) < CLAIM_TIMEOUT_SECONDS:
+        return job
+
+    batch = await get_openai_client().batches.retrieve(batch_id)
+    if batch.status not in FINISHED_STATUSES:
+        update_batch_job(batch_id, batch.status)
+        return get_batch_job(batch_id)
+
+    error_file_id = batch.error_file_id
+    # Claim the job first, so concurrent refreshes don't save its meetings twice.
+    claimed = claim_batch_job(
+        batch_id, INGESTING, unless=(INGESTED,), stale_after=CLAIM_TIMEOUT_SECONDS
+    )
+    if not claimed:
+        return get_batch_job(batch_id)
+    try:
+        transcripts = job["transcripts"]
+        meetings = await _collect_meetings(batch.output_file_id, transcripts)
+        meeting_ids = save_meetings_bulk(meetings)
+    except Exception:
+        # Release the claim so a later refresh can try again.
+        update_batch_job(batch_id, batch.status)
+        raise
+    update_batch_job(
+        batch_id,
+        INGESTED,
+        meeting_ids,
+        failed_count=len(transcripts) - len(meetings),
+        error_file_id=error_file_id,
+    )
+    return get_batch_job(batch_id)
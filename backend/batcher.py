@@ -0,0 +1,95 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+
+class DynamicBatcher:
+    """
+    Collect items submitted concurrently and process them with one call.
+
+    Items are grouped until `max_batch_size` is reached or `max_wait_ms` has
+    passed since the first item of the batch arrived. The wrapped function
+    receives a list of items and must return one result per item, in order.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[list[Any]], Awaitable[list[Any]]],
+        max_batch_size: int = 8,
+        max_wait_ms: int = 50,
+    ):
+        self.func = func
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running: set[asyncio.Task] = set()
+
+    async def __call__(self, item: Any) -> Any:
+        """Submit one item and wait for its result."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use (or a new event loop): start the collector on this loop.
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._running.add(loop.create_task(self._collect(self._queue)))
+
+        future = loop.create_future()
+        await self._queue.put((item, future))  # type: ignore[union-attr]
+        return await future
+
+    async def _collect(self, queue: asyncio.Queue) -> None:
+        """Drain the queue into batches and dispatch each batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Keep collecting while this batch is in flight.
+            task = loop.create_task(self._dispatch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _dispatch(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        """Run the wrapped function on a batch and resolve each caller's future."""
+        try:
+            results = await self.func([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Batched function returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def dynamically(
+    max_batch_size: int = 8, max_wait_ms: int = 50
+) -> Callable[[Callable[[list[Any]], Awaitable[list[Any]]]], DynamicBatcher]:
+    """
+    Decorator turning `async def f(items: list) -> list` into a per-item
+    coroutine whose concurrent calls are batched together:
+
+        @batcher.dynamically(max_batch_size=8, max_wait_ms=50)
+        async def plan(transcripts: list[str]) -> list[dict]: ...
+
+        result = await plan(transcript)
+    """
+
+    def decorator(func: Callable[[list[Any]], Awaitable[list[Any]]]) -> DynamicBatcher:
+        return DynamicBatcher(func, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    return decorator
@@ -1,34 +1,104 @@
 import sqlite3
-import json
 import os
+import threading
+import time
 from datetime import datetime
 from typing import Optional
+from jsonutil import dumps, loads
 
 DB_PATH = os.path.join(os.path.dirname(__file__), "meetings.db")
 
+_local = threading.local()
+
 
 def get_connection() -> sqlite3.Connection:
-    """Get a SQLite connection with row factory enabled."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """
+    Get this thread's SQLite connection, opening it on first use.
+    Connections live for the lifetime of the thread so each request
+    skips the open/pragma setup cost.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        _local.conn = conn
     return conn
 
 
 def init_db() -> None:
-    """Create the meetings table if it doesn't exist."""
+    """Create the meetings and batch job tables and their indexes if they don't exist."""
     conn = get_connection()
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS meetings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL DEFAULT 'Untitled Meeting',
-            transcript TEXT NOT NULL,
-            results_json TEXT NOT NULL DEFAULT '[]',
-            summary TEXT DEFAULT '',
-            created_at TEXT NOT NULL DEFAULT (datetime('now'))
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS meetings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL DEFAULT 'Untitled Meeting',
+                transcript TEXT NOT NULL,
+                results_json TEXT NOT NULL DEFAULT '[]',
+                summary TEXT DEFAULT '',
+                created_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_created ON meetings(created_at DESC)"
         )
-    """)
-    conn.commit()
-    conn.close()
+
+        # Full-text index over the searchable columns, kept in sync by triggers.
+        fts_exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meetings_fts'"
+        ).fetchone()
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(
+                title, transcript, summary, content='meetings', content_rowid='id'
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS meetings_fts_insert AFTER INSERT ON meetings BEGIN
+                INSERT INTO meetings_fts (rowid, title, transcript, summary)
+                VALUES (new.id, new.title, new.transcript, new.summary);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS meetings_fts_delete AFTER DELETE ON meetings BEGIN
+                INSERT INTO meetings_fts (meetings_fts, rowid, title, transcript, summary)
+                VALUES ('delete', old.id, old.title, old.transcript, old.summary);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS meetings_fts_update AFTER UPDATE ON meetings BEGIN
+                INSERT INTO meetings_fts (meetings_fts, rowid, title, transcript, summary)
+                VALUES ('delete', old.id, old.title, old.transcript, old.summary);
+                INSERT INTO meetings_fts (rowid, title, transcript, summary)
+                VALUES (new.id, new.title, new.transcript, new.summary);
+            END
+        """)
+        if not fts_exists:
+            # Index meetings saved before the FTS table existed.
+            conn.execute("INSERT INTO meetings_fts (meetings_fts) VALUES ('rebuild')")
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS batch_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                transcripts_json TEXT NOT NULL,
+                meeting_ids_json TEXT,
+                failed_count INTEGER NOT NULL DEFAULT 0,
+                error_file_id TEXT,
+                claimed_at REAL,
+                created_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+        """)
+        # Add the failure columns to tables created before they existed.
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(batch_jobs)")}
+        if "failed_count" not in columns:
+            conn.execute("ALTER TABLE batch_jobs ADD COLUMN failed_count INTEGER NOT NULL DEFAULT 0")
+            conn.execute("ALTER TABLE batch_jobs ADD COLUMN error_file_id TEXT")
+        if "claimed_at" not in columns:
+            conn.execute("ALTER TABLE batch_jobs ADD COLUMN claimed_at REAL")
 
 
 def save_meeting(
@@ -39,25 +109,52 @@ def save_meeting(
 ) -> int:
     """Save a meeting and return its ID."""
     conn = get_connection()
-    cursor = conn.execute(
-        "INSERT INTO meetings (title, transcript, results_json, summary) VALUES (?, ?, ?, ?)",
-        (title, transcript, json.dumps(results), summary),
-    )
-    meeting_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    return meeting_id  # type: ignore
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO meetings (title, transcript, results_json, summary) VALUES (?, ?, ?, ?)",
+            (title, transcript, dumps(results), summary),
+        )
+    return cursor.lastrowid  # type: ignore
+
+
+def save_meetings_bulk(meetings: list[tuple[str, str, list[dict], str]]) -> list[int]:
+    """
+    Save many meetings in a single transaction and return their IDs in order.
+    Each entry is a (title, transcript, results, summary) tuple.
+    """
+    if not meetings:
+        return []
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            "INSERT INTO meetings (title, transcript, results_json, summary) VALUES (?, ?, ?, ?)",
+            [(title, transcript, dumps(results), summary) for title, transcript, results, summary in meetings],
+        )
+        # Rows inserted in one write transaction get consecutive IDs.
+        last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - len(meetings) + 1, last_id + 1))
+
+
+def _fts_query(search: str) -> str:
+    """
+    Turn free-form user input into an FTS5 query.
+    Each word is quoted so FTS operators in the input are matched literally,
+    and prefix-matched so partial words still find results.
+    """
+    terms = search.split()
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
 
 
 def get_meetings(limit: int = 50, offset: int = 0, search: Optional[str] = None) -> list[dict]:
     """Get a list of meetings, optionally filtered by search term."""
     conn = get_connection()
-    if search:
+    query = _fts_query(search) if search else ""
+    if query:
         rows = conn.execute(
-            "SELECT id, title, summary, created_at FROM meetings "
-            "WHERE title LIKE ? OR transcript LIKE ? OR summary LIKE ? "
-            "ORDER BY created_at DESC LIMIT ? OFFSET ?",
-            (f"%{search}%", f"%{search}%", f"%{search}%", limit, offset),
+            "SELECT m.id, m.title, m.summary, m.created_at FROM meetings_fts f "
+            "JOIN meetings m ON m.id = f.rowid "
+            "WHERE meetings_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+            (query, limit, offset),
         ).fetchall()
     else:
         rows = conn.execute(
@@ -65,7 +162,6 @@ def get_meetings(limit: int = 50, offset: int = 0, search: Optional[str] = None)
             "ORDER BY created_at DESC LIMIT ? OFFSET ?",
             (limit, offset),
         ).fetchall()
-    conn.close()
     return [dict(row) for row in rows]
 
 
@@ -75,18 +171,99 @@ def get_meeting(meeting_id: int) -> Optional[dict]:
     row = conn.execute(
         "SELECT * FROM meetings WHERE id = ?", (meeting_id,)
     ).fetchone()
-    conn.close()
     if row is None:
         return None
     meeting = dict(row)
-    meeting["results"] = json.loads(meeting.pop("results_json"))
+    meeting["results"] = loads(meeting.pop("results_json"))
     return meeting
 
 
 def delete_meeting(meeting_id: int) -> bool:
     """Delete a meeting by ID. Returns True if deleted."""
     conn = get_connection()
-    cursor = conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor = conn.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
+    return cursor.rowcount > 0
+
+
+# --- Batch jobs ---
+
+
+def save_batch_job(batch_id: str, transcripts: list[str], status: str) -> None:
+    """Record a submitted batch job and the transcripts it covers."""
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            "INSERT INTO batch_jobs (id, status, transcripts_json) VALUES (?, ?, ?)",
+            (batch_id, status, dumps(transcripts)),
+        )
+
+
+def get_batch_job(batch_id: str) -> Optional[dict]:
+    """Get a batch job by ID, with its transcripts and saved meeting IDs."""
+    conn = get_connection()
+    row = conn.execute("SELECT * FROM batch_jobs WHERE id = ?", (batch_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(row)
+    job["transcripts"] = loads(job.pop("transcripts_json"))
+    meeting_ids_json = job.pop("meeting_ids_json")
+    job["meeting_ids"] = loads(meeting_ids_json) if meeting_ids_json else None
+    return job
+
+
+def update_batch_job(
+    batch_id: str,
+    status: str,
+    meeting_ids: Optional[list[int]] = None,
+    failed_count: int = 0,
+    error_file_id: Optional[str] = None,
+) -> None:
+    """
+    Update a batch job's status, and once results are saved, its meeting IDs,
+    the number of transcripts that failed, and OpenAI's error file ID.
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute(
+            """
+            UPDATE batch_jobs
+            SET status = ?,
+                meeting_ids_json = COALESCE(?, meeting_ids_json),
+                failed_count = ?,
+                error_file_id = COALESCE(?, error_file_id)
+            WHERE id = ?
+            """,
+            (
+                status,
+                dumps(meeting_ids) if meeting_ids is not None else None,
+                failed_count,
+                error_file_id,
+                batch_id,
+            ),
+        )
+
+
+def claim_batch_job(
+    batch_id: str, status: str, unless: tuple[str, ...], stale_after: float
+) -> bool:
+    """
+    Atomically set a batch job's status to the claim `status` and record when,
+    unless it's in one of the `unless` statuses or another caller claimed it
+    less than `stale_after` seconds ago. An older claim is taken over, since
+    its holder probably died. Returns whether this caller made the change.
+    """
+    now = time.time()
+    placeholders = ", ".join("?" * len(unless))
+    conn = get_connection()
+    with conn:
+        cursor = conn.execute(
+            f"""
+            UPDATE batch_jobs SET status = ?, claimed_at = ?
+            WHERE id = ?
+              AND status NOT IN ({placeholders})
+              AND NOT (status = ? AND COALESCE(claimed_at, 0) > ?)
+            """,
+            (status, now, batch_id, *unless, status, now - stale_after),
+        )
     return cursor.rowcount > 0
@@ -0,0 +1,19 @@
+import orjson
+
+JSONDecodeError = orjson.JSONDecodeError
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj, sort_keys: bool = False) -> str:
+    """Serialize `obj` to a JSON string using orjson."""
+    return dumpb(obj, sort_keys).decode("utf-8")
+
+
+def dumpb(obj, sort_keys: bool = False) -> bytes:
+    """Serialize `obj` to JSON bytes using orjson, e.g. for an HTTP body."""
+    option = _OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _OPTIONS
+    return orjson.dumps(obj, default=str, option=option)
+
+
+loads = orjson.loads
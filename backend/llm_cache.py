@@ -0,0 +1,77 @@
+import hashlib
+import os
+import time
+from typing import Optional
+from database import get_connection
+from jsonutil import dumps, loads
+
+# Bump when the shape of cached responses changes so stale entries are ignored.
+CACHE_VERSION = 1
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+def make_key(model: str, messages: list[dict], tools_json: str) -> str:
+    """
+    Build an exact-match cache key for a chat completion request. The tool
+    schema is passed pre-serialized since it's the same for every request.
+    """
+    payload = dumps(
+        {"version": CACHE_VERSION, "model": model, "messages": messages},
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8"))
+    digest.update(tools_json.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """Exact-match cache of assembled LLM responses, stored in SQLite."""
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        # Read when the cache is created, so LLM_CACHE_TTL_SECONDS from .env applies.
+        if ttl_seconds is None:
+            ttl_seconds = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(DEFAULT_TTL_SECONDS)))
+        self.ttl_seconds = ttl_seconds
+        conn = get_connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response_json TEXT NOT NULL,
+                    created_at TEXT NOT NULL DEFAULT (datetime('now')),
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_cache_expires ON llm_cache(expires_at)"
+            )
+            conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached response for `key`, or None if missing or expired."""
+        conn = get_connection()
+        row = conn.execute(
+            "SELECT response_json, expires_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None and row["expires_at"] < time.time():
+            with conn:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            row = None
+        if row is None:
+            return None
+        return loads(row["response_json"])
+
+    def set(self, key: str, value: dict) -> None:
+        """
+        Store a response under `key` for the configured TTL. Expired entries
+        are purged here too, since most keys are never looked up again.
+        """
+        now = time.time()
+        conn = get_connection()
+        with conn:
+            conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response_json, expires_at) VALUES (?, ?, ?)",
+                (key, dumps(value), now + self.ttl_seconds),
+            )
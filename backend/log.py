@@ -0,0 +1,76 @@
+"""
+Non-blocking console logging.
+
+Records go onto a queue and a QueueListener thread writes them to stdout, so
+request handlers never wait on terminal I/O. Colors and phase separators are
+only rendered when stdout is a terminal; piped logs get plain lines.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+SEPARATOR = "═" * 60
+
+# ANSI color codes
+C_RESET = "\033[0m"
+C_BOLD = "\033[1m"
+C_DIM = "\033[2m"
+C_RED = "\033[31m"
+C_GREEN = "\033[32m"
+C_YELLOW = "\033[33m"
+C_BLUE = "\033[34m"
+C_MAGENTA = "\033[35m"
+C_CYAN = "\033[36m"
+
+DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true", "yes")
+
+
+class ConsoleFormatter(logging.Formatter):
+    """
+    Renders the message only, styled by the record's extras:
+      extra={"color": C_GREEN}  wraps the line in that color
+      extra={"phase": True}     draws the line as a phase header
+    """
+
+    LEVEL_COLORS = {logging.WARNING: C_YELLOW, logging.ERROR: C_RED}
+
+    def __init__(self, use_color: bool):
+        super().__init__("%(message)s")
+        self.use_color = use_color
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        if not self.use_color:
+            return message
+        if getattr(record, "phase", False):
+            return (
+                f"\n{C_CYAN}{SEPARATOR}{C_RESET}\n"
+                f"  {C_CYAN}{C_BOLD}{message}{C_RESET}\n"
+                f"{C_CYAN}{SEPARATOR}{C_RESET}"
+            )
+        color = getattr(record, "color", None) or self.LEVEL_COLORS.get(record.levelno)
+        return f"{color}{message}{C_RESET}" if color else message
+
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(ConsoleFormatter(use_color=sys.stdout.isatty()))
+
+_listener = logging.handlers.QueueListener(_queue, _console)
+_listener.start()
+atexit.register(_listener.stop)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a logger that writes to the console through the shared queue."""
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        logger.addHandler(logging.handlers.QueueHandler(_queue))
+        logger.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+        logger.propagate = False
+    return logger
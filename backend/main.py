@@ -1,37 +1,102 @@
-import json
+import asyncio
+import os
 from contextlib import asynccontextmanager
 from typing import Optional
 from fastapi import FastAPI, UploadFile, File, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
-from transcribe import transcribe_audio, get_model as get_whisper_model
-from agent import run_agent, client, MODEL
-from tools import TOOL_REGISTRY
-from database import init_db, save_meeting, get_meetings, get_meeting, delete_meeting
+from dotenv import load_dotenv
+
+# Local modules read their settings (WHISPER_*, DEBUG, ...) at import time,
+# so .env has to be loaded before any of them.
+load_dotenv()
+
+from jsonutil import dumps, dumpb
+from log import get_logger
+from transcribe import (
+    transcribe_audio,
+    stream_transcribe,
+    decode_audio,
+    join_segments,
+    get_model as get_whisper_model,
+)
+from agent import (
+    run_agent,
+    run_agent_batched,
+    prefix_key,
+    meeting_title,
+    client,
+    MODEL,
+    BATCH_ENABLED,
+)
+from batch_jobs import submit_batch, refresh_batch
+from tools import TOOL_REGISTRY, create_calendar_invite
+from database import (
+    init_db,
+    save_meeting,
+    save_meetings_bulk,
+    get_meetings,
+    get_meeting,
+    delete_meeting,
+)
+
+logger = get_logger("main")
+
+# /api/analyze/bulk runs one agent loop per transcript inside a single request,
+# so keep it well under the proxy's 300 s read timeout. Larger sets belong in
+# the batch endpoint.
+MAX_BULK_TRANSCRIPTS = 20
+
+# Meetings are saved in groups of this many as they finish, so analyses that
+# completed survive a timeout or client disconnect later in the request.
+BULK_SAVE_CHUNK = 5
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    import asyncio
-
-    print("\n🚀 Starting Meeting Agent...")
+    logger.info("🚀 Starting Meeting Agent...")
     init_db()
-    print("✅ Ready! (Whisper loads on first transcription; LLM checked in background)\n")
+    logger.info("✅ Ready! (Whisper loading and LLM check run in background)")
+
+    # Load Whisper off the request path, so the first transcription doesn't pay for it
+    async def _warm_whisper():
+        try:
+            await asyncio.to_thread(get_whisper_model)
+        except Exception as e:
+            logger.warning("⚠️  Whisper load: %s", e)
 
-    # Don't block startup: verify LLM in background thread
+    # Don't block startup: verify LLM in the background
     async def _check_llm():
         try:
-            await asyncio.to_thread(client.models.list)
-            print("✅ LLM API connected")
+            await client.models.list()
+            logger.info("✅ LLM API connected")
         except Exception as e:
-            print(f"⚠️  LLM check: {e}")
+            logger.warning("⚠️  LLM check: %s", e)
 
+    asyncio.create_task(_warm_whisper())
     asyncio.create_task(_check_llm())
     yield
+    await client.close()
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON responses rendered with orjson, which is several times faster than
+    the stdlib on our payloads (long HTML and ICS strings). FastAPI's own
+    ORJSONResponse is deprecated in newer releases, hence this one.
+    """
+
+    def render(self, content) -> bytes:
+        return dumpb(content)
 
 
-app = FastAPI(title="Meeting Agent API", lifespan=lifespan)
+app = FastAPI(
+    title="Meeting Agent API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -46,14 +111,27 @@ class AnalyzeRequest(BaseModel):
     transcript: str
 
 
+class BulkAnalyzeRequest(BaseModel):
+    transcripts: list[str]
+
+
+class CalendarInviteRequest(BaseModel):
+    title: str
+    start_time: str
+    end_time: str
+    description: str = ""
+    attendees: list[str] = []
+    # From the analysis' event_details, so every download is the same event.
+    uid: Optional[str] = None
+
+
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
 
 
-@app.post("/api/transcribe")
-async def transcribe(file: UploadFile = File(...)):
-    """Accept an audio file and return the transcript."""
+def _check_audio_upload(file: UploadFile) -> None:
+    """Reject uploads that aren't audio or are empty."""
     if not file.content_type or not file.content_type.startswith("audio"):
         if file.content_type not in ("video/webm", "application/octet-stream"):
             raise HTTPException(
@@ -61,14 +139,43 @@ async def transcribe(file: UploadFile = File(...)):
                 detail=f"Expected audio file, got {file.content_type}",
             )
 
-    audio_bytes = await file.read()
-    if len(audio_bytes) == 0:
+    # UploadFile is a SpooledTemporaryFile: pass the handle through instead of
+    # reading the whole upload into memory.
+    size = file.size if file.size is not None else file.file.seek(0, os.SEEK_END)
+    if size == 0:
         raise HTTPException(status_code=400, detail="Empty audio file")
 
-    transcript = transcribe_audio(audio_bytes, file.filename or "audio.webm")
+
+@app.post("/api/transcribe")
+async def transcribe(file: UploadFile = File(...)):
+    """Accept an audio file and return the transcript."""
+    _check_audio_upload(file)
+    # Off the event loop, so concurrent uploads reach separate Whisper workers.
+    transcript = await asyncio.to_thread(transcribe_audio, file.file)
     return {"transcript": transcript}
 
 
+@app.post("/api/transcribe/stream")
+async def transcribe_stream(file: UploadFile = File(...)):
+    """
+    Accept an audio file and stream the transcript as Server-Sent Events:
+    a "segment" event per decoded segment, then "done" with the full text.
+    """
+    _check_audio_upload(file)
+    # Decode before responding: the upload is closed once the handler returns.
+    audio = await asyncio.to_thread(decode_audio, file.file)
+
+    async def event_stream():
+        pieces = []
+        async for text in stream_transcribe(audio):
+            pieces.append(text)
+            yield {"event": "segment", "data": dumps({"type": "segment", "content": text})}
+        transcript = join_segments(pieces)
+        yield {"event": "done", "data": dumps({"type": "done", "transcript": transcript})}
+
+    return EventSourceResponse(event_stream())
+
+
 @app.post("/api/analyze")
 async def analyze(request: AnalyzeRequest):
     """
@@ -81,33 +188,128 @@ async def analyze(request: AnalyzeRequest):
 
     collected_results: list[dict] = []
     final_summary = ""
-    meeting_title = "Untitled Meeting"
+    title = "Untitled Meeting"
 
-    def event_stream():
-        nonlocal final_summary, meeting_title
-        for event in run_agent(request.transcript):
+    async def event_stream():
+        nonlocal final_summary, title
+        agent_events = run_agent_batched if BATCH_ENABLED else run_agent
+        async for event in agent_events(request.transcript):
             if event["type"] == "tool_result":
                 collected_results.append(event.get("result", {}))
             if event["type"] == "final":
                 final_summary = event.get("content", "")
-                words = final_summary.split()
-                meeting_title = " ".join(words[:8]) + ("..." if len(words) > 8 else "")
-            yield {"event": event["type"], "data": json.dumps(event)}
+                title = meeting_title(final_summary)
+            yield {"event": event["type"], "data": dumps(event)}
 
         meeting_id = save_meeting(
             transcript=request.transcript,
             results=collected_results,
             summary=final_summary,
-            title=meeting_title,
+            title=title,
         )
         yield {
             "event": "meeting_saved",
-            "data": json.dumps({"type": "meeting_saved", "meeting_id": meeting_id}),
+            "data": dumps({"type": "meeting_saved", "meeting_id": meeting_id}),
         }
 
     return EventSourceResponse(event_stream())
 
 
+@app.post("/api/analyze/bulk")
+async def analyze_bulk(request: BulkAnalyzeRequest):
+    """
+    Analyze several transcripts and save them as meetings, a few per
+    transaction as they finish. Transcripts are processed back-to-back,
+    ordered so that ones sharing an opening are adjacent and hit the
+    provider's prompt cache. Results are returned in the order the
+    transcripts were submitted.
+    """
+    if not request.transcripts or not all(t.strip() for t in request.transcripts):
+        raise HTTPException(status_code=400, detail="Transcripts must be non-empty")
+    if len(request.transcripts) > MAX_BULK_TRANSCRIPTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_TRANSCRIPTS} transcripts per request; use /api/analyze/batch for more",
+        )
+
+    order = sorted(range(len(request.transcripts)), key=lambda i: prefix_key(request.transcripts[i]))
+    meetings: list[dict] = [{} for _ in request.transcripts]
+    unsaved: list[int] = []
+
+    def save_finished() -> None:
+        batch = [meetings[i] for i in unsaved]
+        meeting_ids = save_meetings_bulk(
+            [
+                (m["title"], request.transcripts[i], m["results"], m["summary"])
+                for m, i in zip(batch, unsaved)
+            ]
+        )
+        for i, meeting_id in zip(unsaved, meeting_ids):
+            meetings[i]["meeting_id"] = meeting_id
+        unsaved.clear()
+
+    for i in order:
+        transcript = request.transcripts[i]
+        results: list[dict] = []
+        summary = ""
+        error = None
+        async for event in run_agent(transcript):
+            if event["type"] == "tool_result":
+                results.append(event.get("result", {}))
+            elif event["type"] == "final":
+                summary = event.get("content", "")
+            elif event["type"] == "error":
+                error = event.get("content", "")
+
+        title = meeting_title(summary) if summary else "Untitled Meeting"
+        meetings[i] = {
+            "title": title,
+            "summary": summary,
+            "results": results,
+            "error": error,
+        }
+        unsaved.append(i)
+        if len(unsaved) >= BULK_SAVE_CHUNK:
+            save_finished()
+
+    save_finished()
+    return meetings
+
+
+@app.post("/api/analyze/batch")
+async def analyze_batch(request: BulkAnalyzeRequest):
+    """
+    Queue transcripts for offline analysis via the OpenAI Batch API
+    (about 50% cheaper, results within 24 hours). Poll the returned job
+    with GET /api/analyze/batch/{batch_id}.
+    """
+    if not request.transcripts or not all(t.strip() for t in request.transcripts):
+        raise HTTPException(status_code=400, detail="Transcripts must be non-empty")
+    try:
+        return await submit_batch(request.transcripts)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Batch submission failed: {e}")
+
+
+@app.get("/api/analyze/batch/{batch_id}")
+async def read_batch(batch_id: str):
+    """Get a batch job's status; saves its meetings once the batch has finished."""
+    try:
+        job = await refresh_batch(batch_id)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Batch status check failed: {e}")
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job
+
+
+@app.post("/api/calendar/ics")
+def calendar_ics(request: CalendarInviteRequest):
+    """Build the .ics file for a calendar invite's event details, when it's downloaded."""
+    invite = create_calendar_invite(**request.model_dump())
+    return Response(invite.ics_content, media_type="text/calendar")
+
+
 # --- Meeting History Endpoints ---
 
 
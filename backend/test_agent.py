@@ -5,7 +5,9 @@ Quick smoke test — run from the backend/ directory:
 Requires OPENROUTER_API_KEY in .env
 """
 
+import asyncio
 from agent import run_agent
+from tools import to_dict
 
 SAMPLE_TRANSCRIPT = """
 Sarah: Good morning everyone. Let's get started with the weekly standup.
@@ -38,23 +40,28 @@ print("=" * 60)
 print("Running Meeting Agent on sample transcript...")
 print("=" * 60)
 
-for event in run_agent(SAMPLE_TRANSCRIPT):
-    etype = event["type"]
-    if etype == "thinking":
-        print(f"\n[Thinking] {event['content']}")
-    elif etype == "tool_call":
-        print(f"\n[Tool Call] {event['tool']}({list(event['arguments'].keys())})")
-    elif etype == "tool_result":
-        result = event["result"]
-        print(f"[Tool Result] type={result.get('type', 'unknown')}")
-        if "markdown" in result:
-            print(result["markdown"][:200] + "...")
-        elif "event_details" in result:
-            print(f"  Event: {result['event_details']}")
-    elif etype == "final":
-        print(f"\n[Final] {event['content']}")
-    elif etype == "error":
-        print(f"\n[ERROR] {event['content']}")
+
+async def main():
+    async for event in run_agent(SAMPLE_TRANSCRIPT):
+        etype = event["type"]
+        if etype == "thinking":
+            print(f"\n[Thinking] {event['content']}")
+        elif etype == "tool_call":
+            print(f"\n[Tool Call] {event['tool']}({list(event['arguments'].keys())})")
+        elif etype == "tool_result":
+            result = to_dict(event["result"])
+            print(f"[Tool Result] type={result.get('type', 'unknown')}")
+            if "markdown" in result:
+                print(result["markdown"][:200] + "...")
+            elif "event_details" in result:
+                print(f"  Event: {result['event_details']}")
+        elif etype == "final":
+            print(f"\n[Final] {event['content']}")
+        elif etype == "error":
+            print(f"\n[ERROR] {event['content']}")
+
+
+asyncio.run(main())
 
 print("\n" + "=" * 60)
 print("Done!")
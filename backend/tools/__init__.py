@@ -4,6 +4,7 @@ from tools.report import create_report
 from tools.email_summary import create_email_summary
 from tools.action_items import create_action_items
 from tools.sentiment import analyze_sentiment
+from tools.result import to_dict
 
 TOOL_REGISTRY = {
     "create_calendar_invite": create_calendar_invite,
@@ -1,6 +1,21 @@
+import csv
+import io
 from datetime import datetime
 from typing import Optional
 
+DEFAULTS = {
+    "task": "",
+    "assignee": "Unassigned",
+    "deadline": "TBD",
+    "priority": "medium",
+}
+
+PRIORITY_EMOJI = {"high": "🔴", "medium": "🟡", "low": "🟢"}
+
+MD_ROW = "| {} | {} {} | {} | {} | {} |\n"
+
+CSV_HEADER = ["#", "Priority", "Task", "Assignee", "Deadline"]
+
 
 def create_action_items(
     items: list[dict],
@@ -26,23 +41,19 @@ def create_action_items(
     action_date = date or datetime.now().strftime("%Y-%m-%d")
     title = meeting_title or "Meeting"
 
-    normalized: list[dict] = []
-    for item in items:
-        normalized.append({
-            "task": item.get("task", ""),
-            "assignee": item.get("assignee", "Unassigned"),
-            "deadline": item.get("deadline", "TBD"),
-            "priority": item.get("priority", "medium"),
-        })
-
-    priority_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}
-
-    md_rows = []
-    for i, item in enumerate(normalized, 1):
-        emoji = priority_emoji.get(item["priority"], "⚪")
-        md_rows.append(
-            f"| {i} | {emoji} {item['priority'].capitalize()} | {item['task']} | {item['assignee']} | {item['deadline']} |"
+    normalized = [{**DEFAULTS, **item} for item in items]
+
+    md_rows = "".join(
+        MD_ROW.format(
+            i,
+            PRIORITY_EMOJI.get(item["priority"], "⚪"),
+            item["priority"].capitalize(),
+            item["task"],
+            item["assignee"],
+            item["deadline"],
         )
+        for i, item in enumerate(normalized, 1)
+    )
 
     markdown = f"""# Action Items: {title}
 
@@ -51,25 +62,25 @@ def create_action_items(
 
 | # | Priority | Task | Assignee | Deadline |
 |---|----------|------|----------|----------|
-{chr(10).join(md_rows)}
-
+{md_rows}
 ---
 
 *Action items extracted by Meeting Agent.*
 """
 
-    csv_lines = ["#,Priority,Task,Assignee,Deadline"]
-    for i, item in enumerate(normalized, 1):
-        task_escaped = item["task"].replace('"', '""')
-        csv_lines.append(
-            f'{i},{item["priority"]},"{task_escaped}",{item["assignee"]},{item["deadline"]}'
-        )
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    writer.writerows(
+        (i, item["priority"], item["task"], item["assignee"], item["deadline"])
+        for i, item in enumerate(normalized, 1)
+    )
 
     return {
         "type": "action_items",
         "items": normalized,
         "markdown": markdown,
-        "csv": "\n".join(csv_lines),
+        "csv": buf.getvalue(),
         "metadata": {
             "meeting_title": title,
             "date": action_date,
@@ -1,8 +1,58 @@
 import os
-import uuid
-from datetime import datetime
-from icalendar import Calendar, Event, vText
+import secrets
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Optional
+from urllib.parse import quote_plus
+
+# The invite always has the same shape, so it's emitted straight from a
+# template rather than through an iCalendar object model.
+_ICS_TEMPLATE = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Meeting Agent//EN\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+    "BEGIN:VEVENT\r\n"
+    "{summary}\r\n"
+    "DTSTART:{dtstart}\r\n"
+    "DTEND:{dtend}\r\n"
+    "DTSTAMP:{dtstamp}\r\n"
+    "UID:{uid}\r\n"
+    "{attendees}"
+    "{description}\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+# RFC 5545 TEXT escaping.
+_ICS_ESCAPE = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n", "\r": ""})
+
+# Control characters (CR/LF included) can't appear in a mailto: address.
+_CONTROL_CHARS = str.maketrans(dict.fromkeys([*range(0x20), 0x7F]))
+
+_BASE = "https://calendar.google.com/calendar/render?action=TEMPLATE"
+
+# RFC 5545 caps content lines at 75 octets; longer lines are folded.
+_ICS_LINE_OCTETS = 75
+
+
+@dataclass(slots=True, frozen=True)
+class EventDetails:
+    title: str
+    description: str
+    start_time: str
+    end_time: str
+    attendees: list[str]
+    uid: str
+
+
+@dataclass(slots=True, frozen=True)
+class CalendarInviteResult:
+    type: str = field(default="calendar_invite", init=False)
+    ics_content: Optional[str]
+    google_calendar_url: str
+    event_details: EventDetails
 
 
 def create_calendar_invite(
@@ -11,72 +61,108 @@ def create_calendar_invite(
     end_time: str,
     description: str = "",
     attendees: Optional[list[str]] = None,
-) -> dict:
+    include_ics: bool = True,
+    uid: Optional[str] = None,
+) -> CalendarInviteResult:
     """
     Generate a .ics calendar invite and optionally create a Google Calendar event.
 
-    Returns a dict with:
-      - ics_content: the raw .ics file string
+    Returns a CalendarInviteResult with:
+      - ics_content: the raw .ics file string, or None unless include_ics
       - google_calendar_url: a URL to add the event via Google Calendar web UI
-      - event_details: structured event info
+      - event_details: structured event info, including the event's UID.
+        Pass it back as `uid` to rebuild the same invite later.
     """
+    now_s = time.time_ns() // 1_000_000_000
     try:
         dt_start = datetime.fromisoformat(start_time)
         dt_end = datetime.fromisoformat(end_time)
     except ValueError:
-        dt_start = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
-        dt_end = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
-
-    cal = Calendar()
-    cal.add("prodid", "-//Meeting Agent//EN")
-    cal.add("version", "2.0")
-    cal.add("calscale", "GREGORIAN")
-
-    event = Event()
-    event.add("summary", title)
-    event.add("dtstart", dt_start)
-    event.add("dtend", dt_end)
-    event.add("description", description)
-    event.add("uid", str(uuid.uuid4()))
-    event.add("dtstamp", datetime.now())
-
-    if attendees:
-        for attendee in attendees:
-            if "@" in attendee:
-                event.add("attendee", f"mailto:{attendee}")
-            else:
-                event["attendee"] = vText(attendee)
-
-    cal.add_component(event)
-    ics_content = cal.to_ical().decode("utf-8")
-
-    google_url = _build_google_calendar_url(title, description, dt_start, dt_end)
-
-    return {
-        "type": "calendar_invite",
-        "ics_content": ics_content,
-        "google_calendar_url": google_url,
-        "event_details": {
-            "title": title,
-            "description": description,
-            "start_time": dt_start.isoformat(),
-            "end_time": dt_end.isoformat(),
-            "attendees": attendees or [],
-        },
-    }
+        today = datetime.fromtimestamp(now_s).replace(minute=0, second=0, microsecond=0)
+        dt_start = today.replace(hour=9)
+        dt_end = today.replace(hour=10)
+    dtstart = _ics_fmt(dt_start)
+    dtend = _ics_fmt(dt_end)
+
+    attendees = attendees or []
+    uid = uid or f"{secrets.token_hex(16)}@meeting-agent"
+    ics_content = None
+    if include_ics:
+        # Email addresses first, then bare names; attendee order carries no meaning.
+        attendee_lines = "".join(
+            _fold(f"ATTENDEE:mailto:{attendee.translate(_CONTROL_CHARS)}") + "\r\n"
+            for attendee in attendees
+            if "@" in attendee
+        ) + "".join(
+            _fold(f"ATTENDEE:{attendee.translate(_ICS_ESCAPE)}") + "\r\n"
+            for attendee in attendees
+            if "@" not in attendee
+        )
+        ics_content = _ICS_TEMPLATE.format(
+            summary=_fold(f"SUMMARY:{title.translate(_ICS_ESCAPE)}"),
+            dtstart=dtstart,
+            dtend=dtend,
+            dtstamp=_ics_fmt(datetime.fromtimestamp(now_s, timezone.utc)),
+            uid=uid.translate(_CONTROL_CHARS),
+            attendees=attendee_lines,
+            description=_fold(f"DESCRIPTION:{description.translate(_ICS_ESCAPE)}"),
+        )
+
+    google_url = _build_google_calendar_url(title, description, dtstart, dtend)
+
+    return CalendarInviteResult(
+        ics_content=ics_content,
+        google_calendar_url=google_url,
+        event_details=EventDetails(
+            title=title,
+            description=description,
+            start_time=dt_start.isoformat(),
+            end_time=dt_end.isoformat(),
+            attendees=attendees,
+            uid=uid,
+        ),
+    )
+
+
+def _ics_fmt(dt: datetime) -> str:
+    """
+    Format as an iCalendar date-time (YYYYMMDDTHHMMSS), without strftime.
+    Timezone-aware times are converted to UTC and get a "Z" suffix; naive
+    ones stay floating (the attendee's local time).
+    """
+    suffix = ""
+    if dt.utcoffset() is not None:
+        dt = dt.astimezone(timezone.utc)
+        suffix = "Z"
+    return (
+        f"{dt.year:04d}{dt.month:02d}{dt.day:02d}"
+        f"T{dt.hour:02d}{dt.minute:02d}{dt.second:02d}{suffix}"
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold an iCalendar content line to 75 octets; continuation lines start with a space."""
+    if len(line.encode("utf-8")) <= _ICS_LINE_OCTETS:
+        return line
+    parts: list[str] = []
+    current: list[str] = []
+    size = 0
+    for char in line:
+        octets = len(char.encode("utf-8"))
+        if size + octets > _ICS_LINE_OCTETS:
+            parts.append("".join(current))
+            current, size = [], 1  # the leading space
+        current.append(char)
+        size += octets
+    parts.append("".join(current))
+    return "\r\n ".join(parts)
 
 
 def _build_google_calendar_url(
     title: str,
     description: str,
-    start: datetime,
-    end: datetime,
+    start: str,
+    end: str,
 ) -> str:
-    """Build a Google Calendar 'Add Event' URL (no API key needed)."""
-    from urllib.parse import quote
-
-    fmt = "%Y%m%dT%H%M%S"
-    dates = f"{start.strftime(fmt)}/{end.strftime(fmt)}"
-    base = "https://calendar.google.com/calendar/render"
-    params = f"?action=TEMPLATE&text={quote(title)}&dates={dates}&details={quote(description)}"
-    return base + params
+    """Build a Google Calendar 'Add Event' URL (no API key needed). Times are _ics_fmt strings."""
+    return f"{_BASE}&text={quote_plus(title)}&dates={start}/{end}&details={quote_plus(description)}"
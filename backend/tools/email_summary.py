@@ -1,5 +1,48 @@
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
+from string import Template
 from typing import Optional
+from tools.memo import call_cached
+
+_PLAIN_TPL = Template("""Hi $recipients,
+
+Here is the summary from our meeting on $date:
+
+$body
+
+Best regards,
+Meeting Agent
+""")
+
+_HTML_TPL = Template("""<div style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 600px; margin: 0 auto; color: #333;">
+  <p>Hi $recipients,</p>
+  <p>Here is the summary from our meeting on <strong>$date</strong>:</p>
+  <hr style="border: none; border-top: 1px solid #e5e5e5; margin: 16px 0;" />
+  <div style="white-space: pre-wrap; line-height: 1.6;">$body</div>
+  <hr style="border: none; border-top: 1px solid #e5e5e5; margin: 16px 0;" />
+  <p style="color: #888; font-size: 12px;">Best regards,<br/>Meeting Agent</p>
+</div>""")
+
+# The values come from the LLM, so they're escaped before going into HTML.
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+
+@dataclass(slots=True, frozen=True)
+class EmailMetadata:
+    subject: str
+    date: str
+    attendees: tuple[str, ...]
+    body: str
+
+
+@dataclass(slots=True, frozen=True)
+class EmailSummaryResult:
+    type: str = field(default="email_summary", init=False)
+    subject: str
+    body_plain: str
+    body_html: str
+    metadata: EmailMetadata
 
 
 def create_email_summary(
@@ -7,50 +50,47 @@ def create_email_summary(
     body: str,
     attendees: Optional[list[str]] = None,
     date: Optional[str] = None,
-) -> dict:
+) -> EmailSummaryResult:
     """
     Generate a ready-to-send email summary of a meeting.
 
-    Returns a dict with:
+    Returns an EmailSummaryResult with:
       - type: "email_summary"
       - subject: email subject line
       - body_plain: plain text version
       - body_html: HTML formatted version
       - metadata: structured email info
     """
+    # Retries tend to regenerate the same summary word for word. The date is
+    # resolved first so a cached email never carries a stale default date.
     email_date = date or datetime.now().strftime("%Y-%m-%d")
-    recipient_list = attendees or []
-
-    recipients_str = ", ".join(recipient_list) if recipient_list else "Team"
+    return call_cached(_create_email_summary, subject, body, tuple(attendees or ()), email_date)
 
-    body_plain = f"""Hi {recipients_str},
 
-Here is the summary from our meeting on {email_date}:
-
-{body}
+@lru_cache(maxsize=256)
+def _create_email_summary(
+    subject: str,
+    body: str,
+    recipient_list: tuple[str, ...],
+    email_date: str,
+) -> EmailSummaryResult:
+    recipients_str = ", ".join(recipient_list) if recipient_list else "Team"
 
-Best regards,
-Meeting Agent
-"""
+    body_plain = _PLAIN_TPL.substitute(recipients=recipients_str, date=email_date, body=body)
+    body_html = _HTML_TPL.substitute(
+        recipients=recipients_str.translate(_HTML_ESCAPE),
+        date=email_date.translate(_HTML_ESCAPE),
+        body=body.translate(_HTML_ESCAPE),
+    )
 
-    body_html = f"""<div style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; max-width: 600px; margin: 0 auto; color: #333;">
-  <p>Hi {recipients_str},</p>
-  <p>Here is the summary from our meeting on <strong>{email_date}</strong>:</p>
-  <hr style="border: none; border-top: 1px solid #e5e5e5; margin: 16px 0;" />
-  <div style="white-space: pre-wrap; line-height: 1.6;">{body}</div>
-  <hr style="border: none; border-top: 1px solid #e5e5e5; margin: 16px 0;" />
-  <p style="color: #888; font-size: 12px;">Best regards,<br/>Meeting Agent</p>
-</div>"""
-
-    return {
-        "type": "email_summary",
-        "subject": subject,
-        "body_plain": body_plain,
-        "body_html": body_html,
-        "metadata": {
-            "subject": subject,
-            "date": email_date,
-            "attendees": recipient_list,
-            "body": body,
-        },
-    }
+    return EmailSummaryResult(
+        subject=subject,
+        body_plain=body_plain,
+        body_html=body_html,
+        metadata=EmailMetadata(
+            subject=subject,
+            date=email_date,
+            attendees=recipient_list,
+            body=body,
+        ),
+    )
@@ -0,0 +1,14 @@
+from typing import Any, Callable
+
+
+def call_cached(func: Callable, *args: Any) -> Any:
+    """
+    Call an lru_cache-wrapped tool implementation. LLM arguments don't always
+    match the schema (e.g. objects where strings were expected); those can't
+    be hashed, so they bypass the cache instead of failing the tool call.
+    """
+    try:
+        hash(args)
+    except TypeError:
+        return func.__wrapped__(*args)
+    return func(*args)
@@ -0,0 +1,13 @@
+from dataclasses import fields, is_dataclass
+from typing import Any
+
+
+def to_dict(result: Any) -> Any:
+    """
+    Convert a tool result dataclass (nested ones included) to plain dicts.
+    Results are serialized as-is by orjson, so this is only needed where
+    code reads them as mappings. Dicts pass through unchanged.
+    """
+    if is_dataclass(result):
+        return {f.name: to_dict(getattr(result, f.name)) for f in fields(result)}
+    return result
@@ -1,4 +1,45 @@
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
+from tools.memo import call_cached
+
+# Tone -> (badge text, badge color)
+_TONE_BADGES = {
+    "productive": ("Productive", "green"),
+    "tense": ("Tension Detected", "red"),
+    "casual": ("Casual", "blue"),
+    "mixed": ("Mixed Tone", "yellow"),
+    "positive": ("Positive", "green"),
+    "negative": ("Negative", "red"),
+    "neutral": ("Neutral", "gray"),
+}
+
+# Badge shown instead when a conflict was detected (red badges already say so).
+_CONFLICT_MAP = {
+    badge: (f"{badge[0]} + Conflict", "yellow")
+    for badge in _TONE_BADGES.values()
+    if badge[1] != "red"
+}
+
+
+@dataclass(slots=True, frozen=True)
+class SentimentDetails:
+    overall_tone: str
+    tone_details: str
+    conflict_detected: bool
+    conflict_details: str
+    key_emotions: tuple[str, ...]
+    productivity_score: int
+
+
+@dataclass(slots=True, frozen=True)
+class SentimentResult:
+    type: str = field(default="sentiment", init=False)
+    tone: str
+    badge: str
+    badge_color: str
+    conflict_detected: bool
+    details: SentimentDetails
 
 
 def analyze_sentiment(
@@ -8,7 +49,7 @@ def analyze_sentiment(
     conflict_details: Optional[str] = None,
     key_emotions: Optional[list[str]] = None,
     productivity_score: Optional[int] = None,
-) -> dict:
+) -> SentimentResult:
     """
     Analyze the sentiment and tone of a meeting.
 
@@ -20,45 +61,52 @@ def analyze_sentiment(
       - key_emotions: list of emotions observed (e.g. "enthusiasm", "frustration")
       - productivity_score: 1-10 rating of how productive the meeting was
 
-    Returns a dict with:
+    Returns a SentimentResult with:
       - type: "sentiment"
       - tone: the overall tone label
       - badge: a short badge string for UI display
       - details: full analysis
     """
-    emotions = key_emotions or []
-    score = min(max(productivity_score or 5, 1), 10)
+    # The LLM often repeats the same analysis; results are immutable, so
+    # identical calls can share one.
+    return call_cached(
+        _analyze_sentiment,
+        overall_tone,
+        tone_details,
+        conflict_detected,
+        conflict_details,
+        tuple(key_emotions or ()),
+        productivity_score,
+    )
 
-    tone_badges = {
-        "productive": ("Productive", "green"),
-        "tense": ("Tension Detected", "red"),
-        "casual": ("Casual", "blue"),
-        "mixed": ("Mixed Tone", "yellow"),
-        "positive": ("Positive", "green"),
-        "negative": ("Negative", "red"),
-        "neutral": ("Neutral", "gray"),
-    }
 
-    badge_text, badge_color = tone_badges.get(
-        overall_tone.lower(), (overall_tone.capitalize(), "gray")
-    )
+@lru_cache(maxsize=256)
+def _analyze_sentiment(
+    overall_tone: str,
+    tone_details: str,
+    conflict_detected: bool,
+    conflict_details: Optional[str],
+    emotions: tuple[str, ...],
+    productivity_score: Optional[int],
+) -> SentimentResult:
+    score = min(max(productivity_score or 5, 1), 10)
 
-    if conflict_detected and badge_color != "red":
-        badge_text += " + Conflict"
-        badge_color = "yellow"
+    badge = _TONE_BADGES.get(overall_tone.lower()) or (overall_tone.capitalize(), "gray")
+    if conflict_detected and badge[1] != "red":
+        badge = _CONFLICT_MAP.get(badge) or (f"{badge[0]} + Conflict", "yellow")
+    badge_text, badge_color = badge
 
-    return {
-        "type": "sentiment",
-        "tone": overall_tone,
-        "badge": badge_text,
-        "badge_color": badge_color,
-        "conflict_detected": conflict_detected,
-        "details": {
-            "overall_tone": overall_tone,
-            "tone_details": tone_details,
-            "conflict_detected": conflict_detected,
-            "conflict_details": conflict_details or "",
-            "key_emotions": emotions,
-            "productivity_score": score,
-        },
-    }
+    return SentimentResult(
+        tone=overall_tone,
+        badge=badge_text,
+        badge_color=badge_color,
+        conflict_detected=conflict_detected,
+        details=SentimentDetails(
+            overall_tone=overall_tone,
+            tone_details=tone_details,
+            conflict_detected=conflict_detected,
+            conflict_details=conflict_details or "",
+            key_emotions=emotions,
+            productivity_score=score,
+        ),
+    )
@@ -1,32 +1,155 @@
-import tempfile
+import asyncio
 import os
-from faster_whisper import WhisperModel
+import re
+import threading
+from typing import TYPE_CHECKING, AsyncGenerator, BinaryIO, Iterable, Iterator
+import av
+import numpy as np
+from log import get_logger, C_BLUE, C_GREEN
+
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+logger = get_logger("transcribe")
+
+# A model size ("base", "small", ...) or the path to a CTranslate2 model
+# directory, e.g. one baked into the Docker image.
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+
+# "int8" is the fastest CPU path on x86 (AVX-512 VNNI especially) and the
+# smallest in memory; Apple Silicon does better with "int8_float32". Types
+# the CPU can't run efficiently (e.g. "int8_float16" without F16C) fall back
+# to "int8".
+WHISPER_COMPUTE = os.getenv("WHISPER_COMPUTE", "int8")
+
+# Concurrent transcriptions run on separate model workers, each using
+# WHISPER_CPU_THREADS threads, so size workers to a share of the cores.
+WHISPER_NUM_WORKERS = int(os.getenv("WHISPER_NUM_WORKERS", str(max(1, (os.cpu_count() or 1) // 4))))
+WHISPER_CPU_THREADS = int(os.getenv("WHISPER_CPU_THREADS", "4"))
+
+# Whisper expects 16 kHz mono float32 PCM.
+SAMPLE_RATE = 16000
+
+# Leading bytes -> FFmpeg demuxer. Naming the container up front spares PyAV
+# probing the stream to guess it; anything else is still probed.
+_MAGIC = {
+    b"\x1aE\xdf\xa3": "matroska",  # webm (browser recordings)
+    b"OggS": "ogg",
+    b"RIFF": "wav",
+    b"fLaC": "flac",
+    b"ID3": "mp3",
+}
+
+# Clips shorter than this fit in one 30-second window, so they're decoded
+# without timestamp tokens. (The window itself can't be shrunk: faster-whisper
+# keeps a chunk_length override on the model's shared feature extractor.)
+SHORT_AUDIO_SECONDS = 10
+
+# Runs of whitespace (doubled spaces, stray newlines) left between segments.
+_WS_RE = re.compile(r"\s+")
 
 _model = None
+_model_lock = threading.Lock()
 
 
-def get_model() -> WhisperModel:
-    """Lazy-load the faster-whisper model (base, CPU)."""
+def get_model() -> "WhisperModel":
+    """Load the faster-whisper model once (CPU). Safe to call from any thread."""
     global _model
     if _model is None:
-        _model = WhisperModel("base", device="cpu", compute_type="int8")
+        with _model_lock:
+            if _model is None:
+                # Imported here: faster-whisper pulls in ctranslate2, tokenizers and
+                # onnxruntime, which would otherwise slow down every cold start.
+                import ctranslate2
+                from faster_whisper import WhisperModel
+
+                compute_type = WHISPER_COMPUTE
+                if compute_type not in ctranslate2.get_supported_compute_types("cpu"):
+                    logger.warning(
+                        "⚠️  Compute type '%s' not supported on this CPU, using int8", compute_type
+                    )
+                    compute_type = "int8"
+
+                logger.info(
+                    "🔵 Loading Whisper model '%s' (%s)...",
+                    WHISPER_MODEL,
+                    compute_type,
+                    extra={"color": C_BLUE},
+                )
+                _model = WhisperModel(
+                    WHISPER_MODEL,
+                    device="cpu",
+                    compute_type=compute_type,
+                    cpu_threads=WHISPER_CPU_THREADS,
+                    num_workers=WHISPER_NUM_WORKERS,
+                )
+                logger.info("✅ Whisper model '%s' loaded!", WHISPER_MODEL, extra={"color": C_GREEN})
     return _model
 
 
-def transcribe_audio(audio_bytes: bytes, filename: str = "audio.webm") -> str:
+def decode_audio(audio: BinaryIO) -> np.ndarray:
+    """Decode an audio file object in memory to 16 kHz mono float32 PCM."""
+    head = audio.read(4)
+    audio.seek(0)
+    container_format = next((fmt for magic, fmt in _MAGIC.items() if head.startswith(magic)), None)
+
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+    chunks = []
+    with av.open(audio, mode="r", format=container_format) as container:
+        for frame in container.decode(audio=0):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray())
+        # Flush samples still buffered in the resampler.
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray())
+
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks, axis=1).reshape(-1)
+
+
+def _segments(audio: np.ndarray, beam_size: int) -> Iterator:
+    """
+    Start transcription. Returns faster-whisper's lazy segment generator:
+    the actual decoding happens as it is iterated.
+    Greedy decoding (beam_size=1) with VAD skips silence and is several times
+    faster than beam search, at little cost in accuracy for meeting speech.
+    """
+    model = get_model()
+    segments, info = model.transcribe(
+        audio,
+        beam_size=beam_size,
+        vad_filter=True,
+        vad_parameters={"min_silence_duration_ms": 500},
+        # Don't feed earlier text back in: avoids hallucinations repeating.
+        condition_on_previous_text=False,
+        # A short clip is a single segment; skip decoding timestamp tokens.
+        without_timestamps=len(audio) < SHORT_AUDIO_SECONDS * SAMPLE_RATE,
+    )
+    return segments
+
+
+async def stream_transcribe(audio: np.ndarray, beam_size: int = 1) -> AsyncGenerator[str, None]:
+    """
+    Yield each segment's text as soon as Whisper decodes it. Decoding runs in
+    a worker thread so the event loop stays free. join_segments() turns the
+    pieces into the full transcript.
+    """
+    segments = await asyncio.to_thread(_segments, audio, beam_size)
+    while (segment := await asyncio.to_thread(next, segments, None)) is not None:
+        yield segment.text
+
+
+def transcribe_audio(audio: BinaryIO, beam_size: int = 1) -> str:
+    """Transcribe an audio file object to text using faster-whisper."""
+    segments = _segments(decode_audio(audio), beam_size)
+    return join_segments(segment.text for segment in segments)
+
+
+def join_segments(texts: Iterable[str]) -> str:
     """
-    Transcribe audio bytes to text using faster-whisper.
-    Writes to a temp file since faster-whisper needs a file path.
+    Join segment texts into one transcript, collapsing whitespace in a single
+    pass. Segments usually start with a space, but not always (e.g. ones
+    opening with digits or punctuation), so they're joined with one.
     """
-    suffix = os.path.splitext(filename)[1] or ".webm"
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-        tmp.write(audio_bytes)
-        tmp_path = tmp.name
-
-    try:
-        model = get_model()
-        segments, info = model.transcribe(tmp_path, beam_size=5)
-        transcript = " ".join(segment.text.strip() for segment in segments)
-        return transcript
-    finally:
-        os.unlink(tmp_path)
+    return _WS_RE.sub(" ", " ".join(texts)).strip()
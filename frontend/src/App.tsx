@@ -4,12 +4,16 @@ import AudioRecorder from "./components/AudioRecorder";
 import TranscriptInput from "./components/TranscriptInput";
 import ResultsPanel from "./components/ResultsPanel";
 import MeetingHistory from "./components/MeetingHistory";
-import { analyzeTranscript, fetchMeeting } from "./api";
+import { analyzeTranscript, fetchBatchJob, fetchMeeting, submitBatch } from "./api";
 import type { AgentEvent } from "./api";
 
 type InputTab = "record" | "paste";
 type Page = "new" | "history" | "view";
 
+// Batch jobs finish within 24h; there's no point polling them often.
+const BATCH_POLL_MS = 60_000;
+const BATCH_DONE_STATUSES = ["ingested", "expired", "failed", "cancelled"];
+
 function App() {
   const [inputTab, setInputTab] = useState<InputTab>("paste");
   const [page, setPage] = useState<Page>("new");
@@ -17,6 +21,63 @@ function App() {
   const [loading, setLoading] = useState(false);
   const [transcript, setTranscript] = useState<string | null>(null);
 
+  const pollBatch = useCallback(async (id: string) => {
+    try {
+      const job = await fetchBatchJob(id);
+      if (!BATCH_DONE_STATUSES.includes(job.status)) {
+        setTimeout(() => pollBatch(id), BATCH_POLL_MS);
+        return;
+      }
+      const saved = job.meeting_ids?.length ?? 0;
+      let event: AgentEvent;
+      if (job.status !== "ingested") {
+        event = { type: "error", content: `Batch job ${job.status}` };
+      } else if (saved === 0) {
+        event = { type: "error", content: "Batch finished, but no transcripts could be analyzed" };
+      } else if (job.failed_count > 0) {
+        event = {
+          type: "error",
+          content: `Batch finished — ${saved} saved to History, ${job.failed_count} failed`,
+        };
+      } else {
+        event = { type: "thinking", content: "Batch finished — results saved to History" };
+      }
+      setEvents((prev) => [...prev, event]);
+    } catch {
+      setTimeout(() => pollBatch(id), BATCH_POLL_MS);
+    }
+  }, []);
+
+  const handleQueue = useCallback(
+    async (text: string) => {
+      setTranscript(text);
+      setEvents([]);
+      setLoading(true);
+      setPage("new");
+
+      try {
+        const job = await submitBatch([text]);
+        setEvents([
+          {
+            type: "thinking",
+            content: "Queued in the slow lane — results will appear in History within 24 hours",
+          },
+        ]);
+        setTimeout(() => pollBatch(job.id), BATCH_POLL_MS);
+      } catch (err) {
+        setEvents([
+          {
+            type: "error",
+            content: err instanceof Error ? err.message : "Batch submission failed",
+          },
+        ]);
+      } finally {
+        setLoading(false);
+      }
+    },
+    [pollBatch]
+  );
+
   const handleAnalyze = useCallback(async (text: string) => {
     setTranscript(text);
     setEvents([]);
@@ -208,7 +269,12 @@ function App() {
               {inputTab === "record" ? (
                 <AudioRecorder onTranscript={handleTranscriptFromRecording} />
               ) : (
-                <TranscriptInput onSubmit={handleAnalyze} disabled={loading} />
+                <TranscriptInput
+                  onSubmit={(text, slowLane) =>
+                    slowLane ? handleQueue(text) : handleAnalyze(text)
+                  }
+                  disabled={loading}
+                />
               )}
 
               {/* Show transcript if from recording */}
@@ -1,5 +1,5 @@
 export interface AgentEvent {
-  type: "thinking" | "tool_call" | "tool_result" | "final" | "meeting_saved" | "error";
+  type: "thinking" | "token" | "tool_call" | "tool_result" | "final" | "meeting_saved" | "error";
   content?: string;
   tool?: string;
   arguments?: Record<string, unknown>;
@@ -7,6 +7,12 @@ export interface AgentEvent {
   meeting_id?: number;
 }
 
+export interface TranscribeEvent {
+  type: "segment" | "done";
+  content?: string;
+  transcript?: string;
+}
+
 export interface MeetingSummary {
   id: number;
   title: string;
@@ -23,6 +29,52 @@ export interface MeetingFull {
   created_at: string;
 }
 
+export interface BatchJob {
+  id: string;
+  status: string;
+  created_at: string;
+  transcripts: string[];
+  meeting_ids: number[] | null;
+  failed_count: number;
+  error_file_id: string | null;
+}
+
+async function readEvents<T>(res: Response, onEvent: (event: T) => void): Promise<void> {
+  const reader = res.body?.getReader();
+  if (!reader) throw new Error("No response body");
+
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+
+    const lines = buffer.split("\n");
+    buffer = lines.pop() || "";
+
+    for (const line of lines) {
+      if (line.startsWith("data: ")) {
+        try {
+          const event: T = JSON.parse(line.slice(6));
+          onEvent(event);
+        } catch {
+        }
+      }
+    }
+  }
+
+  if (buffer.startsWith("data: ")) {
+    try {
+      const event: T = JSON.parse(buffer.slice(6));
+      onEvent(event);
+    } catch {
+    }
+  }
+}
+
 export async function transcribeAudio(
   audioBlob: Blob
 ): Promise<{ transcript: string }> {
@@ -42,6 +94,31 @@ export async function transcribeAudio(
   return res.json();
 }
 
+export async function transcribeAudioStream(
+  audioBlob: Blob,
+  onSegment: (text: string) => void
+): Promise<string> {
+  const formData = new FormData();
+  formData.append("file", audioBlob, "recording.webm");
+
+  const res = await fetch("/api/transcribe/stream", {
+    method: "POST",
+    body: formData,
+  });
+
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({ detail: "Transcription failed" }));
+    throw new Error(err.detail || "Transcription failed");
+  }
+
+  let transcript = "";
+  await readEvents<TranscribeEvent>(res, (event) => {
+    if (event.type === "segment") onSegment(event.content || "");
+    if (event.type === "done") transcript = event.transcript || "";
+  });
+  return transcript;
+}
+
 export async function analyzeTranscript(
   transcript: string,
   onEvent: (event: AgentEvent) => void
@@ -57,39 +134,28 @@ export async function analyzeTranscript(
     throw new Error(err.detail || "Analysis failed");
   }
 
-  const reader = res.body?.getReader();
-  if (!reader) throw new Error("No response body");
-
-  const decoder = new TextDecoder();
-  let buffer = "";
-
-  while (true) {
-    const { done, value } = await reader.read();
-    if (done) break;
-
-    buffer += decoder.decode(value, { stream: true });
+  await readEvents<AgentEvent>(res, onEvent);
+}
 
-    const lines = buffer.split("\n");
-    buffer = lines.pop() || "";
+export async function submitBatch(transcripts: string[]): Promise<BatchJob> {
+  const res = await fetch("/api/analyze/batch", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ transcripts }),
+  });
 
-    for (const line of lines) {
-      if (line.startsWith("data: ")) {
-        try {
-          const event: AgentEvent = JSON.parse(line.slice(6));
-          onEvent(event);
-        } catch {
-        }
-      }
-    }
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({ detail: "Batch submission failed" }));
+    throw new Error(err.detail || "Batch submission failed");
   }
 
-  if (buffer.startsWith("data: ")) {
-    try {
-      const event: AgentEvent = JSON.parse(buffer.slice(6));
-      onEvent(event);
-    } catch {
-    }
-  }
+  return res.json();
+}
+
+export async function fetchBatchJob(id: string): Promise<BatchJob> {
+  const res = await fetch(`/api/analyze/batch/${id}`);
+  if (!res.ok) throw new Error("Failed to fetch batch job");
+  return res.json();
 }
 
 export async function fetchMeetings(search?: string): Promise<MeetingSummary[]> {
@@ -111,6 +177,25 @@ export async function deleteMeeting(id: number): Promise<void> {
   if (!res.ok) throw new Error("Failed to delete meeting");
 }
 
+export interface EventDetails {
+  title: string;
+  description: string;
+  start_time: string;
+  end_time: string;
+  attendees: string[];
+  uid?: string;
+}
+
+export async function fetchCalendarICS(details: EventDetails): Promise<string> {
+  const res = await fetch("/api/calendar/ics", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(details),
+  });
+  if (!res.ok) throw new Error("Failed to build calendar invite");
+  return res.text();
+}
+
 export function downloadICS(icsContent: string, filename: string = "invite.ics") {
   const blob = new Blob([icsContent], { type: "text/calendar;charset=utf-8" });
   const url = URL.createObjectURL(blob);
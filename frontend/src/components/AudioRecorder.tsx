@@ -1,6 +1,6 @@
 import { useState, useRef, useCallback } from "react";
 import { Mic, Square, Loader2 } from "lucide-react";
-import { transcribeAudio } from "../api";
+import { transcribeAudioStream } from "../api";
 
 interface Props {
   onTranscript: (transcript: string) => void;
@@ -9,6 +9,7 @@ interface Props {
 export default function AudioRecorder({ onTranscript }: Props) {
   const [recording, setRecording] = useState(false);
   const [transcribing, setTranscribing] = useState(false);
+  const [partial, setPartial] = useState("");
   const [elapsed, setElapsed] = useState(0);
   const [error, setError] = useState<string | null>(null);
 
@@ -38,8 +39,11 @@ export default function AudioRecorder({ onTranscript }: Props) {
         }
 
         setTranscribing(true);
+        setPartial("");
         try {
-          const { transcript } = await transcribeAudio(blob);
+          const transcript = await transcribeAudioStream(blob, (text) =>
+            setPartial((prev) => prev + text)
+          );
           onTranscript(transcript);
         } catch (err) {
           setError(err instanceof Error ? err.message : "Transcription failed");
@@ -94,6 +98,11 @@ export default function AudioRecorder({ onTranscript }: Props) {
             <Loader2 className="h-8 w-8 animate-spin text-blue-400" />
           </div>
           <p className="text-sm text-zinc-400">Transcribing audio...</p>
+          {partial && (
+            <p className="max-h-40 w-full overflow-y-auto rounded-lg bg-zinc-800/50 px-4 py-3 text-sm text-zinc-300">
+              {partial.trim()}
+            </p>
+          )}
         </>
       ) : (
         <>
@@ -16,8 +16,14 @@ import {
   ListChecks,
   Activity,
 } from "lucide-react";
-import { downloadICS, downloadMarkdown, downloadCSV, copyToClipboard } from "../api";
-import type { AgentEvent } from "../api";
+import {
+  downloadICS,
+  downloadMarkdown,
+  downloadCSV,
+  copyToClipboard,
+  fetchCalendarICS,
+} from "../api";
+import type { AgentEvent, EventDetails } from "../api";
 
 interface Props {
   events: AgentEvent[];
@@ -37,6 +43,12 @@ export default function ResultsPanel({ events, loading }: Props) {
   const toolResults = events.filter((e) => e.type === "tool_result");
   const finalMessage = events.find((e) => e.type === "final");
   const errorMessage = events.find((e) => e.type === "error");
+  const streamedText = finalMessage
+    ? ""
+    : events
+        .filter((e) => e.type === "token")
+        .map((e) => e.content || "")
+        .join("");
 
   // Extract sentiment badge if present
   const sentimentResult = toolResults.find(
@@ -111,6 +123,15 @@ export default function ResultsPanel({ events, loading }: Props) {
         }
       })}
 
+      {/* Summary text as it streams in */}
+      {streamedText && (
+        <div className="rounded-xl border border-zinc-700 bg-zinc-800/50 p-4">
+          <div className="prose prose-invert prose-sm max-w-none text-zinc-300">
+            <ReactMarkdown>{streamedText}</ReactMarkdown>
+          </div>
+        </div>
+      )}
+
       {/* Final summary */}
       {finalMessage && (
         <div className="rounded-xl border border-zinc-700 bg-zinc-800/50 p-4">
@@ -194,8 +215,20 @@ function SentimentBadge({ result }: { result: Record<string, unknown> }) {
 
 function CalendarCard({ result }: { result: Record<string, unknown> }) {
   const details = result.event_details as Record<string, unknown> | undefined;
-  const icsContent = result.ics_content as string;
+  const icsContent = result.ics_content as string | null;
   const googleUrl = result.google_calendar_url as string;
+  const [downloadError, setDownloadError] = useState<string | null>(null);
+
+  // Invites from the agent leave the .ics out; build it only when downloaded.
+  const handleDownload = async () => {
+    setDownloadError(null);
+    try {
+      const ics = icsContent ?? (await fetchCalendarICS(details as unknown as EventDetails));
+      downloadICS(ics);
+    } catch (err) {
+      setDownloadError(err instanceof Error ? err.message : "Download failed");
+    }
+  };
 
   return (
     <div className="rounded-xl border border-blue-800/50 bg-blue-500/5 p-5">
@@ -229,7 +262,7 @@ function CalendarCard({ result }: { result: Record<string, unknown> }) {
 
       <div className="flex gap-2">
         <button
-          onClick={() => downloadICS(icsContent)}
+          onClick={handleDownload}
           className="flex items-center gap-1.5 rounded-lg bg-blue-600 px-3 py-1.5 text-xs font-medium text-white transition hover:bg-blue-700"
         >
           <Download className="h-3.5 w-3.5" />
@@ -247,6 +280,12 @@ function CalendarCard({ result }: { result: Record<string, unknown> }) {
           </a>
         )}
       </div>
+      {downloadError && (
+        <p className="mt-2 flex items-center gap-1.5 text-xs text-red-400">
+          <AlertCircle className="h-3.5 w-3.5 shrink-0" />
+          {downloadError}
+        </p>
+      )}
     </div>
   );
 }
@@ -2,17 +2,18 @@ import { useState } from "react";
 import { FileText, Send } from "lucide-react";
 
 interface Props {
-  onSubmit: (transcript: string) => void;
+  onSubmit: (transcript: string, slowLane: boolean) => void;
   disabled?: boolean;
 }
 
 export default function TranscriptInput({ onSubmit, disabled }: Props) {
   const [text, setText] = useState("");
+  const [slowLane, setSlowLane] = useState(false);
 
   const handleSubmit = () => {
     const trimmed = text.trim();
     if (trimmed) {
-      onSubmit(trimmed);
+      onSubmit(trimmed, slowLane);
     }
   };
 
@@ -31,14 +32,27 @@ export default function TranscriptInput({ onSubmit, disabled }: Props) {
         disabled={disabled}
       />
 
-      <button
-        onClick={handleSubmit}
-        disabled={disabled || !text.trim()}
-        className="flex items-center justify-center gap-2 self-end rounded-lg bg-blue-500 px-6 py-2.5 text-sm font-medium text-white transition hover:bg-blue-600 disabled:opacity-40 disabled:cursor-not-allowed"
-      >
-        <Send className="h-4 w-4" />
-        Analyze Transcript
-      </button>
+      <div className="flex items-center justify-between gap-4">
+        <label className="flex items-center gap-2 text-xs text-zinc-400">
+          <input
+            type="checkbox"
+            checked={slowLane}
+            onChange={(e) => setSlowLane(e.target.checked)}
+            disabled={disabled}
+            className="accent-blue-500"
+          />
+          Slow lane (50% off, results within 24h)
+        </label>
+
+        <button
+          onClick={handleSubmit}
+          disabled={disabled || !text.trim()}
+          className="flex items-center justify-center gap-2 rounded-lg bg-blue-500 px-6 py-2.5 text-sm font-medium text-white transition hover:bg-blue-600 disabled:opacity-40 disabled:cursor-not-allowed"
+        >
+          <Send className="h-4 w-4" />
+          {slowLane ? "Queue Transcript" : "Analyze Transcript"}
+        </button>
+      </div>
     </div>
   );
 }